@@ -3,29 +3,57 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import logging
+import time
 from datetime import timedelta
 
+import aiohttp
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from renogyapi import Renogy as api
+from renogyapi.exceptions import RateLimit
 
+from .api import REQUEST_TIMEOUT, RenogyClient
+from .breaker import CircuitOpenError
 from .const import (
+    ADAPTIVE_IDLE_CYCLES,
+    ADAPTIVE_MAX_INTERVAL,
+    BREAKER_CLOSED,
     CONF_ACCESS_KEY,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MAX_CONCURRENT,
     CONF_NAME,
+    CONF_REFRESH_DEADLINE,
+    CONF_SCAN_INTERVAL,
     CONF_SECRET_KEY,
+    CONF_STAGGERED_POLLING,
     COORDINATOR,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_REFRESH_DEADLINE,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STAGGERED_POLLING,
+    DEVICE_BACKOFF_MAX_SKIPPED,
     DOMAIN,
     ISSUE_URL,
     MANAGER,
+    OFFLINE_PROBE_INTERVAL,
     PLATFORMS,
+    STAGGER_MIN_SLOT,
+    TOPOLOGY_COORDINATOR,
+    TOPOLOGY_INTERVAL,
     VERSION,
 )
+from .limiter import async_get_limiter, async_release_limiter
+from .model import ATTRIBUTES, DeviceSnapshot, MetricSchema
+from .store import RenogyDatamapStore, RenogySnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
+_MISSING = object()
 
 
 async def async_setup(  # pylint: disable-next=unused-argument
@@ -45,27 +73,105 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     )
 
     manager = RenogyManager(hass, config_entry).api
-    interval = 30
-    coordinator = RenogyUpdateCoordinator(hass, interval, config_entry, manager)
+    config_entry.async_on_unload(lambda: async_release_limiter(hass, config_entry))
+    datamaps = RenogyDatamapStore(hass, config_entry.entry_id)
+    await datamaps.async_load()
+    topology = RenogyTopologyCoordinator(hass, TOPOLOGY_INTERVAL, config_entry, manager)
+    interval = config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    coordinator = RenogyUpdateCoordinator(
+        hass, interval, config_entry, manager, datamaps, topology
+    )
+
+    snapshot = RenogySnapshotStore(hass, config_entry.entry_id)
+    last_topology, last_devices = await snapshot.async_load()
+
+    if last_topology and last_devices:
+        # Start from the last known data and refresh from the cloud later
+        topology.data = last_topology
+        coordinator.restore(last_devices)
+        # Jitter the first live refresh too, as entries restart together
+        coordinator.start_jitter = manager.limiter.start_jitter()
+
+        async def _async_initial_refresh() -> None:
+            """Fetch live data after setup has finished."""
+            await topology.async_refresh()
+            await coordinator.async_refresh()
+
+        config_entry.async_create_background_task(
+            hass, _async_initial_refresh(), "renogy_initial_refresh"
+        )
+    else:
+        # Fetch initial data so we have data when entities subscribe
+        await topology.async_refresh()
+
+        if not topology.last_update_success:
+            raise ConfigEntryNotReady
+
+        await coordinator.async_refresh()
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            raise ConfigEntryNotReady
 
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+        coordinator.start_jitter = manager.limiter.start_jitter()
 
     hass.data[DOMAIN][config_entry.entry_id] = {
         COORDINATOR: coordinator,
         MANAGER: manager,
+        TOPOLOGY_COORDINATOR: topology,
     }
 
+    @callback
+    def _async_topology_updated() -> None:
+        """Keep the device registry and telemetry in sync with the device list."""
+        if not topology.last_update_success:
+            return
+        async_update_device_registry(hass, config_entry, topology.data)
+        if topology.data.keys() - coordinator.data.keys():
+            _LOGGER.debug("New devices found, refreshing telemetry")
+            config_entry.async_create_background_task(
+                hass, coordinator.async_request_refresh(), "renogy_new_devices"
+            )
+
+    @callback
+    def _async_save_snapshot() -> None:
+        """Keep the last known data for the next startup."""
+        if coordinator.last_update_success:
+            snapshot.async_save(topology.data, coordinator.data)
+
+    _async_topology_updated()
+    config_entry.async_on_unload(topology.async_add_listener(_async_topology_updated))
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_save_snapshot))
+    config_entry.async_on_unload(config_entry.add_update_listener(update_listener))
+
+    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+
+    return True
+
+
+async def update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Reload the entry when options change."""
+    await hass.config_entries.async_reload(config_entry.entry_id)
+
+
+@callback
+def async_update_device_registry(
+    hass: HomeAssistant, config_entry: ConfigEntry, devices: dict
+) -> None:
+    """Create or update device registry entries that differ from the device list."""
     device_registry = dr.async_get(hass)
-    mac = []
+    registered = {
+        identifier[1]: device_entry
+        for device_entry in dr.async_entries_for_config_entry(
+            device_registry, config_entry.entry_id
+        )
+        for identifier in device_entry.identifiers
+        if identifier[0] == DOMAIN
+    }
+    mac: set[str] = set()
     for (
         device_id,
         device,
-    ) in coordinator.data.items():
-        _LOGGER.debug("DEVICE: %s", device)
+    ) in devices.items():
         if "serial" in device.keys() and device["serial"] != "":
             serial = device["serial"]
         else:
@@ -80,13 +186,32 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         )
 
         # Seems some connections may have duplicate macs so we have to keep
-        # a list and fall back to the device_id if there's a duplicate
+        # a set and fall back to the device_id if there's a duplicate
         network_mac = device["mac"] if device["mac"] not in mac else device_id
-        mac.append(device["mac"])
-
-        _LOGGER.debug("Using device: %s via %s", device_id, via)
-
-        device_registry.async_get_or_create(
+        mac.add(device["mac"])
+
+        connection = (dr.CONNECTION_NETWORK_MAC, dr.format_mac(network_mac))
+        desired = {
+            "name": device["name"],
+            "model": device["name"],
+            "model_id": device["model"],
+            "serial_number": serial,
+            "sw_version": device["firmware"],
+            "via_device_id": (
+                registered[via[1]].id if via and via[1] in registered else None
+            ),
+        }
+        existing = registered.get(device_id)
+        if (
+            existing is not None
+            and connection in existing.connections
+            and all(getattr(existing, key) == value for key, value in desired.items())
+        ):
+            continue
+
+        _LOGGER.debug("Updating device: %s via %s", device_id, via)
+
+        registered[device_id] = device_registry.async_get_or_create(
             config_entry_id=config_entry.entry_id,
             connections={(dr.CONNECTION_NETWORK_MAC, network_mac)},
             identifiers={(DOMAIN, device_id)},
@@ -99,10 +224,6 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
             via_device=via,
         )
 
-    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
-
-    return True
-
 
 async def async_remove_config_entry_device(  # pylint: disable-next=unused-argument
     hass: HomeAssistant, config_entry: ConfigEntry, device_entry: dr.DeviceEntry
@@ -135,17 +256,91 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove cached data when an entry is deleted."""
+    await RenogyDatamapStore(hass, config_entry.entry_id).async_remove()
+    await RenogySnapshotStore(hass, config_entry.entry_id).async_remove()
+
+
+class RenogyTopologyCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching the Renogy device list."""
+
+    def __init__(self, hass, interval, config, manager):
+        """Initialize."""
+        self.interval = timedelta(seconds=interval)
+        self.name = f"({config.data.get(CONF_NAME)}) topology"
+        self.config = config
+        self.hass = hass
+        self._manager = manager
+
+        _LOGGER.debug("Device list will be update every %s", self.interval)
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config,
+            name=self.name,
+            update_interval=self.interval,
+        )
+
+    async def _async_update_data(self):
+        """Return the device list."""
+        try:
+            devices = await self._manager.get_device_list()
+        except Exception as error:
+            _LOGGER.debug(
+                "Error updating device list [%s]: %s", type(error).__name__, error
+            )
+            raise UpdateFailed(error) from error
+
+        _LOGGER.debug("Topology data: %s", devices)
+        return devices
+
+
 class RenogyUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Renogy data."""
 
-    def __init__(self, hass, interval, config, manager):
+    def __init__(self, hass, interval, config, manager, datamaps, topology):
         """Initialize."""
         self.interval = timedelta(seconds=interval)
         self.name = f"({config.data.get(CONF_NAME)})"
         self.config = config
         self.hass = hass
         self._manager = manager
-        self._data = {}
+        self.datamaps = datamaps
+        self._topology = topology
+        self._data: dict[str, DeviceSnapshot] = {}
+        self._schemas: dict[str, tuple[list, MetricSchema]] = {}
+        self._probed: dict[str, float] = {}
+        self._sources: dict[str, tuple[dict, dict]] = {}
+        # device id: (consecutive failures, refreshes left to skip)
+        self._failures: dict[str, tuple[int, int]] = {}
+        self._semaphore = asyncio.Semaphore(
+            config.options.get(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT)
+        )
+        self._staggered = config.options.get(
+            CONF_STAGGERED_POLLING, DEFAULT_STAGGERED_POLLING
+        )
+        # Staggered slots set their own interval, so they replace adaptive polling
+        self._adaptive = not self._staggered and config.options.get(
+            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+        )
+        # Position of the next slot's first device in the device list
+        self._cursor = 0
+        self._idle_cycles = 0
+        self.start_jitter = 0.0
+        self._deadline_percent = config.options.get(
+            CONF_REFRESH_DEADLINE, DEFAULT_REFRESH_DEADLINE
+        )
+        self.deadline = 0.0
+        self._request_timeout = REQUEST_TIMEOUT
+        self._set_deadline(self.interval)
+        self._refresh: asyncio.Task | None = None
+        # Listener updates to skip for callers that shared a refresh
+        self._coalesced = 0
+        # Devices to update in the next refresh even if they would be skipped
+        self._requested: set[str] = set()
+        self.changed: set[tuple[str, str]] | None = None
 
         _LOGGER.debug("Data will be update every %s", self.interval)
 
@@ -159,15 +354,140 @@ class RenogyUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         """Return data."""
-        await self.update_sensors()
+        stats = self._manager.stats
+        if self._refresh is not None:
+            # Share the refresh in flight instead of starting another fan-out
+            _LOGGER.debug("Refresh already in progress, waiting for it")
+            stats.coalesced += 1
+            await asyncio.shield(self._refresh)
+            # The refresh's own caller notifies the listeners
+            self._coalesced += 1
+            return self._data
+
+        # The start jitter is spent inside the refresh task, so refreshes
+        # requested meanwhile share it
+        delay, self.start_jitter = self.start_jitter, 0.0
+        self._refresh = asyncio.create_task(self._delayed_update(delay))
+        start = time.monotonic() + delay
+        try:
+            await self._refresh
+        finally:
+            self._refresh = None
+            stats.last_refresh = time.monotonic() - start
+            if stats.last_refresh > self.update_interval.total_seconds():
+                stats.overruns += 1
+                _LOGGER.debug(
+                    "Refresh took %.1fs, longer than the %s interval",
+                    stats.last_refresh,
+                    self.update_interval,
+                )
+        if not self.last_update_success:
+            # Every entity went unavailable with the failed refresh, so all of
+            # them need rewriting even if no readings changed since
+            self.changed = None
         return self._data
 
+    async def _delayed_update(self, delay: float) -> None:
+        """Update sensor data once the start jitter has passed."""
+        if delay:
+            _LOGGER.debug("Delaying first scheduled refresh by %.1fs", delay)
+            await asyncio.sleep(delay)
+        await self.update_sensors()
+
+    async def async_request_device_refresh(self, device_id: str) -> None:
+        """Update one device now, even if it is skipped.
+
+        The rest of the devices, and the staggered slots, are left to the
+        scheduled refreshes.
+        """
+        device = self._topology.data.get(device_id)
+        if device is None or self._refresh is not None:
+            # The refresh in flight has already picked its devices
+            self._requested.add(device_id)
+            return
+
+        [result] = await self._update_devices({device_id: device}, {device_id})
+        devices = self._data | {device_id: self._snapshot(device, result)}
+        self.changed = _diff_devices(self._data, devices)
+        self._data = self.data = devices
+        self.async_update_listeners()
+
+    def restore(self, devices: dict) -> None:
+        """Use previously saved readings until the first live refresh."""
+        self._data = {
+            device_id: DeviceSnapshot.from_dict(device)
+            for device_id, device in devices.items()
+        }
+        self.data = self._data
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners whose device readings changed in the last refresh."""
+        if self._coalesced:
+            self._coalesced -= 1
+            return
+        changed = self.changed
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context is None or context in changed:
+                update_callback()
+
     async def update_sensors(self) -> dict:
         """Update sensor data."""
+        self.changed = None
+        breaker = self._manager.breaker
+        if breaker.state != BREAKER_CLOSED:
+            if breaker.probe_due:
+                # Probe with the cheap device list before polling resumes
+                await self._topology.async_refresh()
+            if breaker.state != BREAKER_CLOSED:
+                self._serve_stale()
+                return
+
         try:
-            self._data = await self._manager.get_devices()
-        except RuntimeError:
-            pass
+            topology = self._topology.data
+            requested, self._requested = self._requested, set()
+            polled = (
+                self._next_slot(topology, requested) if self._staggered else topology
+            )
+            results = await self._update_devices(polled, requested)
+            devices = {}
+            errors = []
+            for (device_id, device), result in zip(polled.items(), results):
+                if isinstance(result, Exception):
+                    errors.append(result)
+                devices[device_id] = self._snapshot(device, result)
+
+            # Only fail the refresh when no device could be updated
+            if errors and len(errors) == len(devices):
+                if breaker.state != BREAKER_CLOSED:
+                    self._serve_stale()
+                    return
+                # A staggered slot covers only some devices, so its failures
+                # stay with those devices
+                if not self._staggered:
+                    raise errors[0]
+            if any(isinstance(error, RateLimit) for error in errors):
+                self._back_off()
+
+            if self._staggered:
+                # Devices outside this slot keep their snapshot, so only the
+                # polled devices notify their entities
+                devices = {
+                    device_id: devices.get(device_id) or self._data[device_id]
+                    for device_id in topology
+                    if device_id in devices or device_id in self._data
+                }
+            for cache in (self._schemas, self._probed, self._sources, self._failures):
+                for device_id in cache.keys() - devices.keys():
+                    del cache[device_id]
+            self._manager.prune(devices.keys())
+            self.changed = _diff_devices(self._data, devices)
+            self._data = devices
+            self._adapt_interval(bool(self.changed))
+        except RateLimit as error:
+            _LOGGER.debug("Rate limit exceeded updating sensors.")
+            self._back_off()
+            raise UpdateFailed(error) from error
         except Exception as error:
             _LOGGER.debug(
                 "Error updating sensors [%s]: %s", type(error).__name__, error
@@ -176,14 +496,268 @@ class RenogyUpdateCoordinator(DataUpdateCoordinator):
 
         _LOGGER.debug("Coordinator data: %s", self._data)
 
+    def _next_slot(self, topology: dict, requested: set[str]) -> dict:
+        """Return the devices to poll in the next staggered slot.
+
+        The device list is split into equal slots spread across the polling
+        interval and polled round-robin. Requested devices and devices
+        without readings yet are polled straight away.
+        """
+        device_ids = list(topology)
+        if not device_ids:
+            return {}
+        slots = min(
+            len(device_ids),
+            max(1, int(self.interval.total_seconds() // STAGGER_MIN_SLOT)),
+        )
+        size = -(-len(device_ids) // slots)
+        start = self._cursor % len(device_ids)
+        self._cursor = (start + size) % len(device_ids)
+        slot = {
+            device_ids[(start + offset) % len(device_ids)] for offset in range(size)
+        }
+        slot |= requested | (topology.keys() - self._data.keys())
+        # Every device is polled once per interval, whatever the slot size
+        self.update_interval = self.interval / -(-len(device_ids) // size)
+        self._set_deadline(self.update_interval)
+        return {
+            device_id: device
+            for device_id, device in topology.items()
+            if device_id in slot
+        }
+
+    def _set_deadline(self, interval: timedelta) -> None:
+        """Bound each refresh, and its telemetry requests, to part of an interval."""
+        # Seconds a refresh may take before unanswered devices are left stale
+        self.deadline = interval.total_seconds() * self._deadline_percent / 100
+        # No latest data request may outlast the whole refresh; the device
+        # list and datamaps keep the client's own timeout
+        self._request_timeout = aiohttp.ClientTimeout(total=self.deadline)
+
+    async def _update_devices(self, topology: dict, requested: set[str]) -> list:
+        """Update every device, stopping at the refresh deadline.
+
+        Each result is a snapshot, the exception the update raised, or None
+        when the device did not answer before the deadline.
+        """
+        tasks = [
+            asyncio.create_task(self._update_device(device, device_id in requested))
+            for device_id, device in topology.items()
+        ]
+        if not tasks:
+            return []
+        try:
+            await asyncio.wait(tasks, timeout=self.deadline)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        if pending:
+            _LOGGER.debug(
+                "%s devices did not answer within %.1fs, keeping their last readings",
+                len(pending),
+                self.deadline,
+            )
+        return [
+            None if task in pending else task.exception() or task.result()
+            for task in tasks
+        ]
+
+    def _serve_stale(self) -> None:
+        """Keep the last known data, marked stale, while the cloud is down."""
+        _LOGGER.debug("Circuit open, serving last known data")
+        devices = {}
+        for device_id, snapshot in self._data.items():
+            if not snapshot.stale:
+                # The outage is not the device's fault, so keep it available
+                snapshot = copy.copy(snapshot)
+                snapshot.failed = False
+                snapshot.stale = True
+            devices[device_id] = snapshot
+        self.changed = _diff_devices(self._data, devices)
+        self._data = devices
+
+    def _snapshot(
+        self, device: dict, result: DeviceSnapshot | BaseException | None
+    ) -> DeviceSnapshot:
+        """Return the snapshot for a result of _update_devices."""
+        if result is None:
+            return self._last_known(device, stale=True)
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            return self._device_failed(device, result)
+        return result
+
+    def _device_failed(self, device: dict, error: Exception) -> DeviceSnapshot:
+        """Back off a device whose update failed and keep its last readings."""
+        device_id = device["deviceId"]
+        _LOGGER.debug(
+            "Error updating device %s [%s]: %s", device_id, type(error).__name__, error
+        )
+        self._sources.pop(device_id, None)
+        # Rate limits and an open circuit hold every request, so they are not
+        # this device's fault
+        if isinstance(error, (RateLimit, CircuitOpenError)):
+            return self._last_known(device, stale=True)
+        failures = self._failures.get(device_id, (0, 0))[0] + 1
+        skipped = min(2 ** (failures - 1) - 1, DEVICE_BACKOFF_MAX_SKIPPED)
+        self._failures[device_id] = (failures, skipped)
+        return self._last_known(device, failed=True)
+
+    def _last_known(
+        self, device: dict, failed: bool = False, stale: bool = False
+    ) -> DeviceSnapshot:
+        """Return the device with the readings from the last refresh."""
+        previous = self._data.get(device["deviceId"])
+        if previous is None:
+            return DeviceSnapshot(device, failed=failed, stale=stale)
+        return DeviceSnapshot(device, previous.schema, previous.values, failed, stale)
+
+    def _adapt_interval(self, changed: bool) -> None:
+        """Poll slower while readings are idle and faster once they move."""
+        if not self._adaptive:
+            return
+
+        if changed:
+            self._idle_cycles = 0
+            if self.update_interval != self.interval:
+                _LOGGER.debug("Readings changed, polling every %s", self.interval)
+                self.update_interval = self.interval
+            return
+
+        self._idle_cycles += 1
+        if self._idle_cycles >= ADAPTIVE_IDLE_CYCLES:
+            self._idle_cycles = 0
+            self._back_off()
+
+    def _back_off(self) -> None:
+        """Double the polling interval up to the adaptive maximum."""
+        if not self._adaptive:
+            return
+
+        self.update_interval = min(
+            self.update_interval * 2, timedelta(seconds=ADAPTIVE_MAX_INTERVAL)
+        )
+        _LOGGER.debug("Backing off, polling every %s", self.update_interval)
+
+    async def _update_device(
+        self, device: dict, requested: bool = False
+    ) -> DeviceSnapshot:
+        """Fetch latest data for a single device."""
+        device_id = device["deviceId"]
+        failures, skipped = self._failures.get(device_id, (0, 0))
+        if skipped and not requested:
+            self._failures[device_id] = (failures, skipped - 1)
+            return self._last_known(device, failed=True)
+        if (
+            device["status"] == "offline"
+            and not requested
+            and not self._probe_due(device_id)
+        ):
+            # Keep the last readings; entities show them as unavailable
+            return self._last_known(device)
+        if device["status"] != "offline":
+            self._probed.pop(device_id, None)
+
+        async with self._semaphore:
+            data = await self._manager.get_latest_data(device_id, self._request_timeout)
+            self._failures.pop(device_id, None)
+            # Nothing changed since the last refresh; an unchanged body comes
+            # back as the same object, so this is usually an identity check
+            previous = self._data.get(device_id)
+            if (
+                previous is not None
+                and not previous.stale
+                and self._sources.get(device_id) == (device, data)
+            ):
+                return previous
+            self._sources[device_id] = (device, data)
+            if not data:
+                return DeviceSnapshot(device)
+            datamap = self.datamaps.get(device_id, device["firmware"])
+            if datamap is None:
+                datamap = await self._manager.get_datamap(device_id)
+                if datamap:
+                    self.datamaps.async_set(device_id, device["firmware"], datamap)
+
+        schema = self._schema(device_id, data, datamap)
+        return DeviceSnapshot(device, schema, tuple(map(data.get, schema.keys)))
+
+    def _probe_due(self, device_id: str) -> bool:
+        """Return whether an offline device should be probed this refresh."""
+        now = time.monotonic()
+        last = self._probed.get(device_id)
+        if last is not None and now - last < OFFLINE_PROBE_INTERVAL:
+            return False
+        _LOGGER.debug("Probing offline device %s", device_id)
+        self._probed[device_id] = now
+        return True
+
+    def _schema(self, device_id: str, data: dict, datamap: list) -> MetricSchema:
+        """Return the device's schema, reused while readings and datamap match."""
+        cached = self._schemas.get(device_id)
+        if (
+            cached is not None
+            and cached[0] is datamap
+            and cached[1].index.keys() == data.keys()
+        ):
+            return cached[1]
+        schema = MetricSchema.build(data, datamap)
+        self._schemas[device_id] = (datamap, schema)
+        return schema
+
+
+def _diff_devices(
+    previous: dict[str, DeviceSnapshot], current: dict[str, DeviceSnapshot]
+) -> set[tuple[str, str]]:
+    """Return the (device_id, key) pairs whose value differs between refreshes."""
+    changed = set()
+    for device_id in previous.keys() | current.keys():
+        old = previous.get(device_id)
+        new = current.get(device_id)
+        if old is new:
+            continue
+        if old is None or new is None:
+            changed.update((device_id, key) for key in (old or new).keys())
+            continue
+        for key in ("parent", *ATTRIBUTES):
+            if getattr(old, key) != getattr(new, key):
+                changed.add((device_id, key))
+        if old.available != new.available:
+            # Availability of every reading follows the device
+            changed.update((device_id, key) for key in old.keys() | new.keys())
+            continue
+        if old.schema is new.schema:
+            changed.update(
+                (device_id, key)
+                for key, old_value, new_value in zip(
+                    new.schema.keys, old.values, new.values
+                )
+                if old_value != new_value
+            )
+            continue
+        for key in old.schema.index.keys() | new.schema.index.keys():
+            if (old.reading(key, _MISSING), old.unit(key)) != (
+                new.reading(key, _MISSING),
+                new.unit(key),
+            ):
+                changed.add((device_id, key))
+    return changed
+
 
 class RenogyManager:
     """Renogy connection manager."""
 
-    def __init__(  # pylint: disable-next=unused-argument
-        self, hass: HomeAssistant, config_entry: ConfigEntry
-    ) -> None:
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize."""
         self._secret_key = config_entry.data.get(CONF_SECRET_KEY)
         self._access_key = config_entry.data.get(CONF_ACCESS_KEY)
-        self.api = api(secret_key=self._secret_key, access_key=self._access_key)
+        self.api = RenogyClient(
+            secret_key=self._secret_key,
+            access_key=self._access_key,
+            session=async_get_clientsession(hass),
+            limiter=async_get_limiter(hass, config_entry),
+        )
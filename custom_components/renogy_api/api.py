@@ -0,0 +1,310 @@
+"""Renogy API client used by the integration."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from typing import Any, Collection, Mapping
+from urllib.parse import urlencode
+
+import aiohttp
+from aiohttp.client_exceptions import ContentTypeError, ServerTimeoutError
+from homeassistant.util.json import json_loads
+from renogyapi import (
+    BASE_URL,
+    CONNECTION_TYPE,
+    DEVICE_LIST,
+    ERROR_TIMEOUT,
+    SUBDEVICE_CONNECTION_TYPE,
+)
+from renogyapi import Renogy as api
+from renogyapi.auth import calc_sign
+from renogyapi.exceptions import NoDevices, NotAuthorized, RateLimit, UrlNotFound
+
+from .breaker import CircuitOpenError, RenogyCircuitBreaker
+from .const import BREAKER_HALF_OPEN, BREAKER_RESET_TIMEOUT, BREAKER_THRESHOLD
+from .limiter import RenogyRateLimiter
+from .stats import RenogyRequestStats
+
+_LOGGER = logging.getLogger(__name__)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=90)
+
+
+class ErrorResponse(Exception):
+    """Raised when the API answered a request with an error."""
+
+
+class RenogyClient(api):
+    """Renogy API client with per-endpoint access for concurrent polling."""
+
+    base_url = BASE_URL
+
+    def __init__(
+        self,
+        secret_key: str,
+        access_key: str,
+        session: aiohttp.ClientSession | None = None,
+        limiter: RenogyRateLimiter | None = None,
+    ) -> None:
+        """Initialize."""
+        super().__init__(secret_key=secret_key, access_key=access_key)
+        self._session = session
+        self.limiter = limiter
+        self.stats = RenogyRequestStats()
+        self.breaker = RenogyCircuitBreaker(BREAKER_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        self._failed: set[str] = set()
+        self._bodies: dict[str, tuple[bytes, Any]] = {}
+
+    def _headers(self, path: str) -> dict[str, str]:
+        """Return signed request headers for the given path."""
+        timestamp = int(time.time() * 1000)
+        params: dict[Any, Any] = {}
+        signature = calc_sign(path, urlencode(params), timestamp, self._key)
+        return {
+            "Access-Key": self._access_key,
+            "Signature": signature,
+            "Timestamp": str(timestamp),
+        }
+
+    async def _request(
+        self, path: str, timeout: aiohttp.ClientTimeout = REQUEST_TIMEOUT
+    ) -> Any:
+        """Send a signed request unless the circuit is open."""
+        if not self.breaker.allow(probe=path == DEVICE_LIST):
+            raise CircuitOpenError
+        if self.breaker.state != BREAKER_HALF_OPEN:
+            return await self._send(path, timeout)
+        try:
+            return await self._send(path, timeout)
+        finally:
+            # A probe that got no answer, for whatever reason, must not leave
+            # the circuit half open and every later request refused
+            if self.breaker.state == BREAKER_HALF_OPEN:
+                self.breaker.record_failure()
+
+    async def _send(
+        self, path: str, timeout: aiohttp.ClientTimeout = REQUEST_TIMEOUT
+    ) -> Any:
+        """Send a signed request once the rate limiter allows it."""
+        endpoint = _endpoint(path)
+        stats = self.stats.endpoints[endpoint]
+        if path in self._failed:
+            stats.retries += 1
+        if self.limiter is not None:
+            await self.limiter.acquire()
+
+        start = time.monotonic()
+        try:
+            response = await self.process_request(
+                self.base_url + path, self._headers(path), timeout
+            )
+        except RateLimit as error:
+            stats.rate_limited += 1
+            self._failed.add(path)
+            if self.limiter is not None:
+                self.limiter.back_off(error.args[0] if error.args else None)
+            raise
+        except Exception:
+            stats.errors += 1
+            self._failed.add(path)
+            raise
+        finally:
+            latency = time.monotonic() - start
+            stats.record(latency)
+            if endpoint != "device_list":
+                self.stats.record_device(_device_id(path), endpoint, latency)
+
+        if isinstance(response, dict) and "error" in response:
+            stats.errors += 1
+            self._failed.add(path)
+        else:
+            self._failed.discard(path)
+        return response
+
+    def prune(self, device_ids: Collection[str]) -> None:
+        """Forget cached bodies and statistics of devices no longer listed."""
+        for url in list(self._bodies):
+            if _endpoint(url) != "device_list" and _device_id(url) not in device_ids:
+                del self._bodies[url]
+        self._failed = {
+            path
+            for path in self._failed
+            if _endpoint(path) == "device_list" or _device_id(path) in device_ids
+        }
+        self.stats.prune(device_ids)
+
+    async def process_request(
+        self,
+        url: str,
+        headers: dict,
+        timeout: aiohttp.ClientTimeout = REQUEST_TIMEOUT,
+    ) -> Any:
+        """Process API requests over the shared session."""
+        if self._session is None:
+            return await super().process_request(url, headers)
+
+        _LOGGER.debug("Request URL: %s", url)
+        try:
+            async with self._session.get(
+                url, headers=headers, timeout=timeout
+            ) as response:
+                message: Any = {}
+                body = await response.read()
+                if response.status >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                endpoint = _endpoint(url)
+                self.stats.endpoints[endpoint].bytes_received += len(body)
+                if endpoint == "latest_data":
+                    self.stats.payload_sizes[_device_id(url)] = len(body)
+
+                # Reuse the parsed body when it is byte-identical to the last one
+                digest = hashlib.blake2b(body, digest_size=16).digest()
+                cached = self._bodies.get(url)
+                if response.status == 200 and cached and cached[0] == digest:
+                    self.stats.endpoints[endpoint].unchanged += 1
+                    return cached[1]
+
+                # orjson decodes the bytes directly, without an interim str.
+                # Hubs answer telemetry requests with an empty body.
+                try:
+                    if body:
+                        message = json_loads(body)
+                except ValueError:
+                    message = body.decode(errors="replace")
+                    _LOGGER.warning("Non-JSON response: %s", message)
+                    message = {"error": message}
+
+                if response.status == 404:
+                    raise UrlNotFound
+                if response.status == 401:
+                    raise NotAuthorized
+                if response.status == 429:
+                    raise RateLimit(_retry_after(response.headers))
+                if response.status != 200:
+                    _LOGGER.error(
+                        "An error reteiving data from the server, code: %s\nmessage: %s",
+                        response.status,
+                        message,
+                    )
+                    message = {"error": message}
+                elif endpoint != "datamap" and not (
+                    isinstance(message, dict) and "error" in message
+                ):
+                    self._bodies[url] = (digest, message)
+                return message
+
+        except (TimeoutError, ServerTimeoutError):
+            self.breaker.record_failure()
+            _LOGGER.error("%s: %s", ERROR_TIMEOUT, url)
+            return {"error": ERROR_TIMEOUT}
+        except aiohttp.ClientConnectionError:
+            self.breaker.record_failure()
+            raise
+        except ContentTypeError as err:
+            _LOGGER.error("%s", err)
+            return {"error": err}
+
+    async def get_device_list(self) -> dict:
+        """Provide the device topology without fetching any device data."""
+        processed_devices = {}
+        responses = await self._request(DEVICE_LIST)
+
+        _LOGGER.debug("Response: %s", responses)
+
+        if len(responses) == 0:
+            _LOGGER.info("Renogy API returned no devices.")
+            raise NoDevices
+
+        for response in responses:
+            if "deviceId" not in response.keys():
+                continue
+
+            # Main 'hub' data
+            data = {}
+            data["deviceId"] = response["deviceId"]
+            data["name"] = response["name"]
+            data["mac"] = response["mac"]
+            data["firmware"] = response["firmware"]
+            data["status"] = response["onlineStatus"]
+            data["connection"] = CONNECTION_TYPE.get(response["connectType"], "Unknown")
+            data["serial"] = response["sn"]
+            data["model"] = response["sku"]
+            data["data"] = {}
+            processed_devices[data["deviceId"]] = data
+
+            if "sublist" not in response.keys() or len(response["sublist"][0]) == 0:
+                continue
+
+            # Sub devices
+            for device in response["sublist"]:
+                _LOGGER.debug("Device: %s", device)
+                data = {}
+                data["parent"] = response["deviceId"]
+                data["deviceId"] = device["deviceId"]
+                data["name"] = device["name"]
+                data["mac"] = device["mac"]
+                data["firmware"] = device["firmware"]
+                data["status"] = device["onlineStatus"]
+                data["connection"] = SUBDEVICE_CONNECTION_TYPE.get(
+                    device["connectType"], "Unknown"
+                )
+                data["serial"] = device["sn"]
+                data["model"] = device["sku"]
+                data["data"] = {}
+                processed_devices[data["deviceId"]] = data
+
+        self._device_list = processed_devices
+        return self._device_list
+
+    async def get_latest_data(
+        self, device_id: str, timeout: aiohttp.ClientTimeout = REQUEST_TIMEOUT
+    ) -> dict:
+        """Provide the raw latest readings of specified device_id.
+
+        An unchanged response returns the same dict as the previous call, so
+        callers must not modify it.
+        """
+        path = f"/device/data/latest/{device_id}"
+        response = await self._request(path, timeout)
+        _LOGGER.debug("Response realtime: %s", response)
+        if "error" in response:
+            raise ErrorResponse(response["error"])
+        if "data" not in response.keys():
+            _LOGGER.warning("No data in API response.")
+            return {}
+        return response["data"]
+
+    async def get_datamap(self, device_id: str) -> list:
+        """Provide the datamap schema of specified device_id."""
+        path = f"/device/datamap/{device_id}"
+        datamap = await self._request(path)
+        _LOGGER.debug("Datamap: %s", datamap)
+        if not isinstance(datamap, list):
+            _LOGGER.warning("No datamap in API response.")
+            return []
+        return datamap
+
+
+def _endpoint(url: str) -> str:
+    """Return the endpoint name used in request statistics for a URL."""
+    if "/device/data/latest/" in url:
+        return "latest_data"
+    if "/device/datamap/" in url:
+        return "datamap"
+    return "device_list"
+
+
+def _device_id(url: str) -> str:
+    """Return the device id a device endpoint URL refers to."""
+    return url.rsplit("/", 1)[-1]
+
+
+def _retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the Retry-After delay in seconds, if the API sent one."""
+    try:
+        return float(headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
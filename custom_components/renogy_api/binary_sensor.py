@@ -8,12 +8,14 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
 
 from .const import BINARY_SENSORS, COORDINATOR, DOMAIN
+from .model import ReadingPosition
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,28 +23,31 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, entry, async_add_devices):
     """Set up binary_sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-
-    binary_sensors = []
-    for device_id, device in coordinator.data.items():
-        for (
-            binary_sensor
-        ) in BINARY_SENSORS:  # pylint: disable=consider-using-dict-items
-            temp_obj = RenogyBinarySensor(
-                BINARY_SENSORS[binary_sensor],
-                device_id,
-                coordinator,
-                entry,
-            )
-            if (
-                binary_sensor in device.keys()
-            ):  # pylint: disable=consider-using-dict-items
-                if temp_obj not in binary_sensors:
-                    binary_sensors.append(temp_obj)
-            if binary_sensor in device["data"].keys():
-                if temp_obj not in binary_sensors:
-                    binary_sensors.append(temp_obj)
-
-    async_add_devices(binary_sensors, False)
+    created: dict[str, set[str]] = {}
+
+    @callback
+    def _async_add_new_binary_sensors() -> None:
+        """Add binary sensors for devices and readings not seen before."""
+        binary_sensors = []
+        for device_id, device in coordinator.data.items():
+            known = created.setdefault(device_id, set())
+            supported = BINARY_SENSORS.keys() & device.keys()
+            for binary_sensor in supported - known:
+                binary_sensors.append(
+                    RenogyBinarySensor(
+                        BINARY_SENSORS[binary_sensor],
+                        device_id,
+                        coordinator,
+                        entry,
+                    )
+                )
+            known |= supported
+
+        if binary_sensors:
+            async_add_devices(binary_sensors, False)
+
+    _async_add_new_binary_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_binary_sensors))
 
 
 class RenogyBinarySensor(CoordinatorEntity, BinarySensorEntity):
@@ -56,15 +61,16 @@ class RenogyBinarySensor(CoordinatorEntity, BinarySensorEntity):
         config: ConfigEntry,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (device_id, sensor_description.key))
         self.coordinator = coordinator
         self._config = config
         self.entity_description = sensor_description
         self._name = sensor_description.name
         self._type = sensor_description.key
         self._device_id = device_id
+        self._position = ReadingPosition(self._type)
 
-        self._attr_name = f"{coordinator.data[device_id]["name"]} {self._name}"
+        self._attr_name = f"{coordinator.data[device_id].name} {self._name}"
         self._attr_unique_id = f"{self._name}_{device_id}"
 
     @property
@@ -76,19 +82,31 @@ class RenogyBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
         return info
 
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        if not super().available:
+            return False
+        if self._type == "status":
+            return True
+        return self.coordinator.data[self._device_id].available
+
     @property
     def is_on(self) -> bool:
         """Return True if the service is on."""
-        data = self.coordinator.data[self._device_id]
-        if self._type in data.keys():
-            if self._type == "status":
-                if data[self._type] == "online":
-                    return True
-                return False
-
-        data = self.coordinator.data[self._device_id]["data"]
-        if self._type not in data.keys():
+        device = self.coordinator.data[self._device_id]
+        if self._type == "status":
+            return device.status == "online"
+
+        index = self._position(device)
+        if index is None:
             _LOGGER.info("binary_sensor [%s] not supported.", self._type)
             return None
-        _LOGGER.debug("binary_sensor [%s]: %s", self._name, data[self._type][0])
-        return cast(bool, data[self._type][0] == 1)
+        _LOGGER.debug("binary_sensor [%s]: %s", self._name, device.values[index])
+        return cast(bool, device.values[index] == 1)
+
+    async def async_update(self) -> None:
+        """Update this entity's device, and only that device."""
+        if not self.enabled:
+            return
+        await self.coordinator.async_request_device_refresh(self._device_id)
@@ -0,0 +1,69 @@
+"""Circuit breaker for requests to the Renogy cloud."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from .const import BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class RenogyCircuitBreaker:
+    """Stop requests after repeated failures until a probe succeeds."""
+
+    def __init__(self, threshold: int, reset_timeout: float) -> None:
+        """Initialize."""
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = BREAKER_CLOSED
+        self.opened_at: float | None = None
+
+    @property
+    def probe_due(self) -> bool:
+        """Return whether the circuit has been open long enough to probe."""
+        return (
+            self.state == BREAKER_OPEN
+            and self.opened_at is not None
+            and time.monotonic() - self.opened_at >= self._reset_timeout
+        )
+
+    def allow(self, probe: bool = False) -> bool:
+        """Return whether a request may be sent, letting one probe through."""
+        if self.state == BREAKER_CLOSED:
+            return True
+        if probe and self.probe_due:
+            _LOGGER.debug("Probing the Renogy cloud")
+            self.state = BREAKER_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after the cloud answered."""
+        if self.state != BREAKER_CLOSED:
+            _LOGGER.info("Renogy cloud is reachable again, resuming requests")
+        self.failures = 0
+        self.state = BREAKER_CLOSED
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit past the threshold."""
+        self.failures += 1
+        if self.state == BREAKER_OPEN:
+            return
+        if self.state == BREAKER_HALF_OPEN or self.failures >= self._threshold:
+            if self.state == BREAKER_CLOSED:
+                _LOGGER.warning(
+                    "Renogy cloud failed %s requests in a row, pausing requests "
+                    "for %s seconds",
+                    self.failures,
+                    self._reset_timeout,
+                )
+            self.state = BREAKER_OPEN
+            self.opened_at = time.monotonic()
@@ -7,8 +7,9 @@ from typing import Any, Dict, Optional
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
-from renogyapi import Renogy as api
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from renogyapi.exceptions import (
     NoDevices,
     NotAuthorized,
@@ -16,7 +17,24 @@ from renogyapi.exceptions import (
     UrlNotFound,
 )
 
-from .const import CONF_ACCESS_KEY, CONF_NAME, CONF_SECRET_KEY, DEFAULT_NAME, DOMAIN
+from .api import RenogyClient
+from .const import (
+    CONF_ACCESS_KEY,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MAX_CONCURRENT,
+    CONF_NAME,
+    CONF_REFRESH_DEADLINE,
+    CONF_SCAN_INTERVAL,
+    CONF_SECRET_KEY,
+    CONF_STAGGERED_POLLING,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_NAME,
+    DEFAULT_REFRESH_DEADLINE,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STAGGERED_POLLING,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,6 +52,14 @@ class OpenEVSEFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         self._data = {}
         self._entry = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> RenogyOptionsFlow:
+        """Get the options flow for this handler."""
+        return RenogyOptionsFlow()
+
     async def async_step_user(
         self, user_input: Dict[str, Any] = None
     ) -> Dict[str, Any]:
@@ -41,13 +67,14 @@ class OpenEVSEFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         self._errors = {}
 
         if user_input is not None:
-            renogy = api(
+            renogy = RenogyClient(
                 secret_key=user_input[CONF_SECRET_KEY],
                 access_key=user_input[CONF_ACCESS_KEY],
+                session=async_get_clientsession(self.hass),
             )
             # Test connection
             try:
-                await renogy.get_devices()
+                await renogy.get_device_list()
             except NoDevices:
                 _LOGGER.exception("No devices found in API request.")
                 self._errors[CONF_ACCESS_KEY] = "no_devices"
@@ -91,13 +118,14 @@ class OpenEVSEFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         self._errors = {}
 
         if user_input is not None:
-            renogy = api(
+            renogy = RenogyClient(
                 secret_key=user_input[CONF_SECRET_KEY],
                 access_key=user_input[CONF_ACCESS_KEY],
+                session=async_get_clientsession(self.hass),
             )
             # Test connection
             try:
-                await renogy.get_devices()
+                await renogy.get_device_list()
             except NoDevices:
                 _LOGGER.exception("No devices found in API request.")
                 self._errors[CONF_ACCESS_KEY] = "no_devices"
@@ -135,6 +163,56 @@ class OpenEVSEFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class RenogyOptionsFlow(config_entries.OptionsFlow):
+    """Options flow for Renogy."""
+
+    async def async_step_init(
+        self, user_input: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Manage the polling options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=_get_options_schema(dict(self.config_entry.options)),
+        )
+
+
+def _get_options_schema(default_dict: Dict[str, Any]) -> vol.Schema:
+    """Get the options schema using the default_dict as a backup."""
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_SCAN_INTERVAL,
+                default=default_dict.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+            vol.Optional(
+                CONF_ADAPTIVE_POLLING,
+                default=default_dict.get(
+                    CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                ),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_MAX_CONCURRENT,
+                default=default_dict.get(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+            vol.Optional(
+                CONF_REFRESH_DEADLINE,
+                default=default_dict.get(
+                    CONF_REFRESH_DEADLINE, DEFAULT_REFRESH_DEADLINE
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=25, max=100)),
+            vol.Optional(
+                CONF_STAGGERED_POLLING,
+                default=default_dict.get(
+                    CONF_STAGGERED_POLLING, DEFAULT_STAGGERED_POLLING
+                ),
+            ): cv.boolean,
+        },
+    )
+
+
 def _get_schema(  # pylint: disable-next=unused-argument
     user_input: Optional[Dict[str, Any]],
     default_dict: Dict[str, Any],
@@ -20,8 +20,10 @@ from homeassistant.const import (
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfFrequency,
+    UnitOfInformation,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.helpers.entity import EntityCategory
 
@@ -29,10 +31,55 @@ from homeassistant.helpers.entity import EntityCategory
 CONF_SECRET_KEY = "secret_key"
 CONF_ACCESS_KEY = "access_key"
 CONF_NAME = "name"
+CONF_MAX_CONCURRENT = "max_concurrent"
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_REFRESH_DEADLINE = "refresh_deadline"
+CONF_STAGGERED_POLLING = "staggered_polling"
 DEFAULT_NAME = "Renogy Core"
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_ADAPTIVE_POLLING = False
+# Percent of the polling interval a refresh may take
+DEFAULT_REFRESH_DEADLINE = 80
+DEFAULT_STAGGERED_POLLING = False
+
+# adaptive polling
+ADAPTIVE_IDLE_CYCLES = 5
+ADAPTIVE_MAX_INTERVAL = 600
+
+# staggered polling slots are at least this many seconds apart
+STAGGER_MIN_SLOT = 1
+
+# offline devices are only probed for telemetry this often
+OFFLINE_PROBE_INTERVAL = 600
+
+# a failing device skips 2 ** (failures - 1) - 1 refreshes, up to this many
+DEVICE_BACKOFF_MAX_SKIPPED = 15
+
+# rate limiting, shared per access key
+RATE_LIMIT_RATE = 5
+RATE_LIMIT_BURST = 20
+RATE_LIMIT_BACKOFF = 60
+MAX_START_JITTER = 10
+
+# circuit breaker, per config entry
+BREAKER_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 300
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# request statistics
+API_ENDPOINTS = ("device_list", "latest_data", "datamap")
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+RECENT_REQUESTS = 10
 
 DOMAIN = "renogy"
 COORDINATOR = "coordinator"
+RATE_LIMITERS = "rate_limiters"
+TOPOLOGY_COORDINATOR = "topology_coordinator"
+TOPOLOGY_INTERVAL = 900
 VERSION = "1.0.0"
 ISSUE_URL = "http://github.com/firstof9/ha-renogy/"
 PLATFORMS = [
@@ -191,7 +238,7 @@ SENSOR_TYPES: Final[dict[str, SensorEntityDescription]] = {
         key="solarChargingAmps",
         name="Solar Charging Ampers",
         icon="mdi:solar-power",
-        native_unit_of_measurement=UnitOfElectricCurrent.MILLIAMPERE, # Fixing the measurement
+        native_unit_of_measurement=UnitOfElectricCurrent.MILLIAMPERE,  # Fixing the measurement
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.CURRENT,
         suggested_display_precision=1,
@@ -465,3 +512,62 @@ SENSOR_TYPES: Final[dict[str, SensorEntityDescription]] = {
         suggested_display_precision=1,
     ),
 }
+
+API_SENSORS: Final[dict[str, SensorEntityDescription]] = {
+    **{
+        f"{endpoint}_latency": SensorEntityDescription(
+            key=f"{endpoint}_latency",
+            name=f"API {endpoint.replace("_", " ").title()} Latency",
+            icon="mdi:timer-outline",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.DURATION,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            suggested_display_precision=0,
+        )
+        for endpoint in API_ENDPOINTS
+    },
+    "circuit_breaker": SensorEntityDescription(
+        key="circuit_breaker",
+        name="API Circuit Breaker",
+        icon="mdi:electric-switch",
+        device_class=SensorDeviceClass.ENUM,
+        options=[BREAKER_CLOSED, BREAKER_OPEN, BREAKER_HALF_OPEN],
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    "bytes_received": SensorEntityDescription(
+        key="bytes_received",
+        name="API Bytes Received",
+        icon="mdi:download-network",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "retries": SensorEntityDescription(
+        key="retries",
+        name="API Retries",
+        icon="mdi:reload",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "rate_limited": SensorEntityDescription(
+        key="rate_limited",
+        name="API Rate Limit Hits",
+        icon="mdi:speedometer-slow",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "overruns": SensorEntityDescription(
+        key="overruns",
+        name="API Refresh Overruns",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+}
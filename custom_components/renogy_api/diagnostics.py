@@ -9,9 +9,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
 
-from .const import COORDINATOR, DOMAIN, CONF_ACCESS_KEY, CONF_SECRET_KEY
+from .const import COORDINATOR, DOMAIN, CONF_ACCESS_KEY, CONF_SECRET_KEY, MANAGER
 
 REDACT_KEYS = {CONF_ACCESS_KEY, CONF_SECRET_KEY}
+REDACT_DEVICE_KEYS = {"mac", "serial"}
 
 
 async def async_get_config_entry_diagnostics(  # pylint: disable-next=unused-argument
@@ -20,12 +21,44 @@ async def async_get_config_entry_diagnostics(  # pylint: disable-next=unused-arg
     """Return diagnostics for a config entry."""
     diag: dict[str, Any] = {}
     diag["config"] = config_entry.as_dict()
+    if config_entry.entry_id in hass.data.get(DOMAIN, {}):
+        coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+        stats = hass.data[DOMAIN][config_entry.entry_id][MANAGER].stats
+        diag["requests"] = stats.as_dict()
+        diag["refresh"] = stats.refresh_dict()
+        diag["circuit_breaker"] = hass.data[DOMAIN][config_entry.entry_id][
+            MANAGER
+        ].breaker.state
+        diag["devices"] = {
+            device_id: {
+                "name": device.name,
+                "model": device.model,
+                "parent": device.parent,
+                "status": device.status,
+                "failed": device.failed,
+                "stale": device.stale,
+                "readings": len(device.values),
+                "payload_bytes": stats.payload_sizes.get(device_id),
+                "datamap_cached": coordinator.datamaps.cached(device_id) is not None,
+            }
+            for device_id, device in (coordinator.data or {}).items()
+        }
     return async_redact_data(diag, REDACT_KEYS)
 
 
-async def async_get_device_diagnostics(  # pylint: disable-next=unused-argument
+async def async_get_device_diagnostics(
     hass: HomeAssistant, config_entry: ConfigEntry, device: DeviceEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a device."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
-    return coordinator.data
+    stats = hass.data[DOMAIN][config_entry.entry_id][MANAGER].stats
+    device_id = next(
+        identifier for domain, identifier in device.identifiers if domain == DOMAIN
+    )
+    snapshot = coordinator.data.get(device_id)
+    diag = {
+        "device": None if snapshot is None else snapshot.as_dict(),
+        "datamap": coordinator.datamaps.cached(device_id),
+        "requests": stats.device_dict(device_id),
+    }
+    return async_redact_data(diag, REDACT_DEVICE_KEYS)
@@ -0,0 +1,96 @@
+"""Rate limiting shared by config entries using the same access key."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CONF_ACCESS_KEY,
+    DOMAIN,
+    MAX_START_JITTER,
+    RATE_LIMIT_BACKOFF,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_RATE,
+    RATE_LIMITERS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RenogyRateLimiter:
+    """Token bucket limiting requests made with one access key."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize."""
+        self._rate = rate
+        self._capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self.entries: set[str] = set()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def back_off(self, retry_after: float | None = None) -> None:
+        """Hold all requests after the API reported a rate limit."""
+        delay = RATE_LIMIT_BACKOFF if retry_after is None else retry_after
+        _LOGGER.debug("Rate limited, holding requests for %s seconds", delay)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        self._tokens = 0.0
+
+    def start_jitter(self) -> float:
+        """Return a random start delay when other entries share this limiter."""
+        if len(self.entries) < 2:
+            return 0.0
+        return random.uniform(0, MAX_START_JITTER)
+
+
+@callback
+def async_get_limiter(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> RenogyRateLimiter:
+    """Return the rate limiter shared by entries with the same access key."""
+    limiters = hass.data.setdefault(DOMAIN, {}).setdefault(RATE_LIMITERS, {})
+    access_key = config_entry.data.get(CONF_ACCESS_KEY)
+    if access_key not in limiters:
+        limiters[access_key] = RenogyRateLimiter(RATE_LIMIT_RATE, RATE_LIMIT_BURST)
+    limiter = limiters[access_key]
+    limiter.entries.add(config_entry.entry_id)
+    return limiter
+
+
+@callback
+def async_release_limiter(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Drop the entry's claim on its rate limiter."""
+    limiters = hass.data[DOMAIN][RATE_LIMITERS]
+    access_key = config_entry.data.get(CONF_ACCESS_KEY)
+    limiter = limiters.get(access_key)
+    if limiter is None:
+        return
+    limiter.entries.discard(config_entry.entry_id)
+    if not limiter.entries:
+        del limiters[access_key]
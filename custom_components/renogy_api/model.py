@@ -0,0 +1,153 @@
+"""Compact snapshots of Renogy device data."""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+# Device attributes as named in the device list; deviceId is kept as device_id
+ATTRIBUTES = ("name", "mac", "firmware", "status", "connection", "serial", "model")
+ATTRIBUTE_KEYS = frozenset(("deviceId", *ATTRIBUTES))
+
+
+class MetricSchema:
+    """Reading keys and units shared by successive snapshots of a device."""
+
+    __slots__ = ("index", "keys", "units")
+
+    def __init__(self, keys: tuple[str, ...], units: tuple[str | None, ...]) -> None:
+        """Initialize."""
+        self.keys = keys
+        self.units = units
+        self.index = {key: position for position, key in enumerate(keys)}
+
+    @classmethod
+    def build(cls, readings: Iterable[str], datamap: list) -> MetricSchema:
+        """Return the schema for the given readings with units from the datamap."""
+        units = {reading["name"]: reading["unit"] for reading in datamap}
+        keys = tuple(readings)
+        return cls(keys, tuple(units.get(key) for key in keys))
+
+
+EMPTY_SCHEMA = MetricSchema((), ())
+
+
+class DeviceSnapshot:
+    """Attributes and readings of one device from a single refresh.
+
+    Readings are held in a tuple of values lined up with the positions in
+    the device's MetricSchema, which is reused until the set of readings or
+    the datamap changes.
+    """
+
+    __slots__ = (
+        "device_id",
+        "parent",
+        "name",
+        "mac",
+        "firmware",
+        "status",
+        "connection",
+        "serial",
+        "model",
+        "schema",
+        "values",
+        "failed",
+        "stale",
+    )
+
+    def __init__(
+        self,
+        device: dict,
+        schema: MetricSchema = EMPTY_SCHEMA,
+        values: tuple = (),
+        failed: bool = False,
+        stale: bool = False,
+    ) -> None:
+        """Initialize from a device list entry."""
+        self.device_id: str = device["deviceId"]
+        self.parent: str | None = device.get("parent")
+        self.name: str = device["name"]
+        self.mac: str = device["mac"]
+        self.firmware: str = device["firmware"]
+        self.status: str = device["status"]
+        self.connection: str = device["connection"]
+        self.serial: str = device["serial"]
+        self.model: str = device["model"]
+        self.schema = schema
+        self.values = values
+        # Readings are the last known ones because this device's update failed
+        self.failed = failed
+        # Readings are the last known ones because the cloud did not answer
+        # in time or no requests were sent
+        self.stale = stale
+
+    @classmethod
+    def from_dict(cls, device: dict) -> DeviceSnapshot:
+        """Return a snapshot of a device dict as produced by as_dict."""
+        data = device["data"]
+        # Readings with a unit are (value, unit) pairs, or lists once stored
+        units = tuple(
+            value[1] if isinstance(value, (tuple, list)) else None
+            for value in data.values()
+        )
+        values = tuple(
+            value[0] if isinstance(value, (tuple, list)) else value
+            for value in data.values()
+        )
+        return cls(device, MetricSchema(tuple(data), units), values)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the device as a dict, with readings as (value, unit) pairs."""
+        device: dict[str, Any] = {"deviceId": self.device_id}
+        if self.parent is not None:
+            device["parent"] = self.parent
+        device.update((key, getattr(self, key)) for key in ATTRIBUTES)
+        device["data"] = {
+            key: value if unit is None else (value, unit)
+            for key, unit, value in zip(
+                self.schema.keys, self.schema.units, self.values
+            )
+        }
+        return device
+
+    def __repr__(self) -> str:
+        """Return the device as a dict for logging."""
+        return repr(self.as_dict())
+
+    def keys(self) -> set[str]:
+        """Return the attribute and reading keys of the device."""
+        return ATTRIBUTE_KEYS | self.schema.index.keys()
+
+    @property
+    def available(self) -> bool:
+        """Return whether the readings are current."""
+        return self.status != "offline" and not self.failed
+
+    def reading(self, key: str, default: Any = None) -> Any:
+        """Return the value of a reading."""
+        position = self.schema.index.get(key)
+        return default if position is None else self.values[position]
+
+    def unit(self, key: str) -> str | None:
+        """Return the unit of a reading from the datamap."""
+        position = self.schema.index.get(key)
+        return None if position is None else self.schema.units[position]
+
+
+class ReadingPosition:
+    """Position of one reading in a device's values, kept per schema."""
+
+    __slots__ = ("key", "position", "schema")
+
+    def __init__(self, key: str) -> None:
+        """Initialize."""
+        self.key = key
+        self.position: int | None = None
+        self.schema: MetricSchema | None = None
+
+    def __call__(self, device: DeviceSnapshot) -> int | None:
+        """Return the reading's position, looking it up only on schema change."""
+        if device.schema is not self.schema:
+            self.schema = device.schema
+            self.position = device.schema.index.get(self.key)
+        return self.position
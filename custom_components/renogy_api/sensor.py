@@ -3,16 +3,23 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from operator import attrgetter
+from typing import Any, Callable
 
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+)
 
-from .const import COORDINATOR, DOMAIN, SENSOR_TYPES
+from .api import RenogyClient
+from .const import API_SENSORS, COORDINATOR, DOMAIN, MANAGER, SENSOR_TYPES
+from .model import ATTRIBUTES, DeviceSnapshot, ReadingPosition
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +36,8 @@ BATTERY_TYPE = {
     4: "Lithium",
 }
 FILTER_UNITS = ["℃", "KWh", "AH"]
+_DEFAULT_UNITS = frozenset([*FILTER_UNITS, ""])
+_MISSING = object()
 CONNECTION_TYPE = {
     "Bluetooth": "mdi:bluetooth",
     "Zigbee": "mdi:zigbee",
@@ -42,23 +51,93 @@ CONNECTION_TYPE = {
     "Hub": "mdi:hub",
 }
 
+VALUE_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "output": OUTPUT_MODES.get,
+    "batteryType": lambda value: (
+        BATTERY_TYPE.get(value) if isinstance(value, int) else value
+    ),
+}
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the OpenEVSE sensors."""
     coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
-    sensors = []
-    for device_id, device in coordinator.data.items():
-        for sensor in SENSOR_TYPES:  # pylint: disable=consider-using-dict-items
-            if sensor in device.keys():  # pylint: disable=consider-using-dict-items
-                sensors.append(
-                    RenogySensor(SENSOR_TYPES[sensor], device_id, coordinator, entry)
-                )
-            if sensor in device["data"].keys():
+    created: dict[str, set[str]] = {}
+
+    @callback
+    def _async_add_new_sensors() -> None:
+        """Add sensors for devices and readings not seen before."""
+        sensors = []
+        for device_id, device in coordinator.data.items():
+            known = created.setdefault(device_id, set())
+            supported = SENSOR_TYPES.keys() & device.keys()
+            for sensor in supported - known:
                 sensors.append(
                     RenogySensor(SENSOR_TYPES[sensor], device_id, coordinator, entry)
                 )
+            known |= supported
+
+        if sensors:
+            async_add_entities(sensors, False)
+
+    _async_add_new_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_sensors))
+
+    hub_id = next(
+        (
+            device_id
+            for device_id, device in coordinator.data.items()
+            if device.parent is None
+        ),
+        None,
+    )
+    if hub_id is not None:
+        manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+        async_add_entities(
+            [
+                RenogyApiSensor(description, hub_id, coordinator, manager)
+                for description in API_SENSORS.values()
+            ],
+            False,
+        )
+
+
+def _top_level_value(key: str) -> Callable[[DeviceSnapshot], Any]:
+    """Return an extractor for a device attribute."""
+    return attrgetter(key)
+
+
+def _reading_value(
+    position: ReadingPosition, convert: Callable[[Any], Any] | None = None
+) -> Callable[[DeviceSnapshot], Any]:
+    """Return an extractor for a reading, optionally converting its value."""
+
+    def extract(device: DeviceSnapshot) -> Any:
+        index = position(device)
+        if index is None:
+            return _MISSING
+        if convert is None:
+            return device.values[index]
+        return convert(device.values[index])
 
-    async_add_entities(sensors, False)
+    return extract
+
+
+def _reading_unit(
+    position: ReadingPosition, default: str | None
+) -> Callable[[DeviceSnapshot], Any]:
+    """Return an extractor for a reading's unit, falling back to default."""
+
+    def extract(device: DeviceSnapshot) -> Any:
+        index = position(device)
+        if index is None:
+            return default
+        unit = device.schema.units[index]
+        if unit is None or unit in _DEFAULT_UNITS:
+            return default
+        return unit
+
+    return extract
 
 
 class RenogySensor(CoordinatorEntity, SensorEntity):
@@ -72,20 +151,31 @@ class RenogySensor(CoordinatorEntity, SensorEntity):
         config: ConfigEntry,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, (device_id, sensor_description.key))
         self._device_id = device_id
         self._config = config
         self.entity_description = sensor_description
         self._name = sensor_description.name
         self._type = sensor_description.key
         self.unit = sensor_description.native_unit_of_measurement
-        self._data = coordinator.data
         self.coordinator = coordinator
         self._state = None
 
+        if self._type in ATTRIBUTES:
+            self._value = _top_level_value(self._type)
+            self._unit = lambda device: self.unit
+            self._available = lambda device: self._value(device) is not None
+        else:
+            position = ReadingPosition(self._type)
+            self._value = _reading_value(position, VALUE_CONVERTERS.get(self._type))
+            self._unit = _reading_unit(position, self.unit)
+            self._available = lambda device: device.available
+
         self._attr_icon = sensor_description.icon
-        self._attr_name = f"{coordinator.data[device_id]["name"]} {self._name}"
+        self._attr_name = f"{coordinator.data[device_id].name} {self._name}"
         self._attr_unique_id = f"{self._name}_{device_id}"
+        if self._type == "connection":
+            self.update_icon()
 
     @property
     def device_info(self) -> dict:
@@ -98,64 +188,96 @@ class RenogySensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
-        if self._type in self.coordinator.data[self._device_id]:
-            self.update_icon()
-            return self.coordinator.data[self._device_id][self._type]
-
-        data = self.coordinator.data[self._device_id]["data"]
-        if data is None:
-            self._state = None
-        if self._type in data.keys():
-            if self._type == "output":
-                try:
-                    value = OUTPUT_MODES[data[self._type][0]]
-                except KeyError:
-                    value = None
-            elif self._type == "batteryType" and isinstance(data[self._type][0], int):
-                try:
-                    value = BATTERY_TYPE[data[self._type][0]]
-                except KeyError:
-                    value = None
-            else:
-                value = data[self._type][0]
+        value = self._value(self.coordinator.data[self._device_id])
+        if value is not _MISSING:
             self._state = value
-        _LOGGER.debug("Sensor [%s] updated value: %s", self._type, self._state)
         return self._state
 
     @property
     def native_unit_of_measurement(self) -> Any:
         """Return the unit of measurement."""
-        data = self.coordinator.data[self._device_id]["data"]
-        if not data or self._type not in data:
-            return self.unit
-
-        if not isinstance(data[self._type], tuple):
-            return self.unit
-
-        if data[self._type][1] in FILTER_UNITS:
-            return self.unit
-
-        if data[self._type][1] == "":
-            if self.unit is None:
-                return None
-            return self.unit
-
-        return data[self._type][1]
+        return self._unit(self.coordinator.data[self._device_id])
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        data = self.coordinator.data[self._device_id]
-        return self._type not in data or (
-            self._type in data and data[self._type] is not None
-        )
+        return self._available(self.coordinator.data[self._device_id])
 
     @property
     def should_poll(self) -> bool:
         """No need to poll. Coordinator notifies entity of updates."""
         return False
 
+    async def async_update(self) -> None:
+        """Update this entity's device, and only that device."""
+        if not self.enabled:
+            return
+        await self.coordinator.async_request_device_refresh(self._device_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._type == "connection":
+            self.update_icon()
+        super()._handle_coordinator_update()
+
     def update_icon(self) -> None:
         """Update connection type icon."""
-        connection = self.coordinator.data[self._device_id][self._type]
-        self._attr_icon = CONNECTION_TYPE[connection]
+        connection = self.coordinator.data[self._device_id].connection
+        self._attr_icon = CONNECTION_TYPE.get(connection, self.entity_description.icon)
+
+
+class RenogyApiSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor for the config entry's Renogy cloud API requests."""
+
+    _unrecorded_attributes = frozenset({"histogram"})
+
+    def __init__(
+        self,
+        sensor_description: SensorEntityDescription,
+        device_id: str,
+        coordinator: DataUpdateCoordinator,
+        client: RenogyClient,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._device_id = device_id
+        self._breaker = client.breaker
+        self._stats = client.stats
+        self._type = sensor_description.key
+        self._endpoint = self._stats.endpoints.get(self._type.removesuffix("_latency"))
+        self.entity_description = sensor_description
+
+        self._attr_name = (
+            f"{coordinator.data[device_id].name} {sensor_description.name}"
+        )
+        self._attr_unique_id = f"{sensor_description.name}_{device_id}"
+
+    @property
+    def device_info(self) -> dict:
+        """Return a port description for device registry."""
+        info = {
+            "identifiers": {(DOMAIN, self._device_id)},
+        }
+        return info
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        if self._type == "circuit_breaker":
+            return self._breaker.state
+        if self._endpoint is None:
+            return getattr(self._stats, self._type)
+        latency = self._endpoint.mean_latency
+        return None if latency is None else latency * 1000
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the endpoint's request statistics."""
+        if self._type == "circuit_breaker":
+            return {"failures": self._breaker.failures}
+        if self._type == "overruns":
+            return self._stats.refresh_dict()
+        if self._endpoint is None:
+            return None
+        return self._endpoint.as_dict()
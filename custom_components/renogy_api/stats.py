@@ -0,0 +1,133 @@
+"""Request statistics for the Renogy cloud API."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Collection
+
+from .const import API_ENDPOINTS, LATENCY_BUCKETS, RECENT_REQUESTS
+
+
+class EndpointStats:
+    """Counters and a latency histogram for one API endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.unchanged = 0
+        self.bytes_received = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, latency: float) -> None:
+        """Record the latency of one request, in seconds."""
+        self.requests += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Return the mean request latency in seconds."""
+        if not self.requests:
+            return None
+        return self.latency_total / self.requests
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the histogram bucket bound holding the given fraction."""
+        if not self.requests:
+            return None
+        wanted = fraction * self.requests
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.histogram):
+            seen += count
+            if seen >= wanted:
+                return bound
+        return self.latency_max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics and state attributes."""
+        buckets = [f"<={bound}s" for bound in LATENCY_BUCKETS]
+        buckets.append(f">{LATENCY_BUCKETS[-1]}s")
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "unchanged": self.unchanged,
+            "bytes_received": self.bytes_received,
+            "latency_mean": self.mean_latency,
+            "latency_p50": self.percentile(0.5),
+            "latency_p95": self.percentile(0.95),
+            "latency_max": self.latency_max,
+            "histogram": dict(zip(buckets, self.histogram)),
+        }
+
+
+class RenogyRequestStats:
+    """Request statistics for one config entry, per endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.endpoints = {endpoint: EndpointStats() for endpoint in API_ENDPOINTS}
+        self.devices: dict[str, deque[tuple[str, float]]] = {}
+        self.payload_sizes: dict[str, int] = {}
+        # Refreshes that outlasted the polling interval, and refreshes that
+        # were folded into one already in progress
+        self.overruns = 0
+        self.coalesced = 0
+        self.last_refresh: float | None = None
+
+    def record_device(self, device_id: str, endpoint: str, latency: float) -> None:
+        """Record the latency of a recent request for one device."""
+        if device_id not in self.devices:
+            self.devices[device_id] = deque(maxlen=RECENT_REQUESTS)
+        self.devices[device_id].append((endpoint, latency))
+
+    def device_dict(self, device_id: str) -> dict[str, Any]:
+        """Return the recent requests and payload size for one device."""
+        return {
+            "payload_bytes": self.payload_sizes.get(device_id),
+            "recent": [
+                {"endpoint": endpoint, "latency": latency}
+                for endpoint, latency in self.devices.get(device_id, ())
+            ],
+        }
+
+    def prune(self, device_ids: Collection[str]) -> None:
+        """Drop the recent requests and payload sizes of other devices."""
+        for cache in (self.devices, self.payload_sizes):
+            for device_id in cache.keys() - device_ids:
+                del cache[device_id]
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the bytes received from all endpoints."""
+        return sum(stats.bytes_received for stats in self.endpoints.values())
+
+    @property
+    def retries(self) -> int:
+        """Return the retried requests to all endpoints."""
+        return sum(stats.retries for stats in self.endpoints.values())
+
+    @property
+    def rate_limited(self) -> int:
+        """Return the rate limited requests to all endpoints."""
+        return sum(stats.rate_limited for stats in self.endpoints.values())
+
+    def refresh_dict(self) -> dict[str, Any]:
+        """Return how refreshes kept up with the polling interval."""
+        return {
+            "overruns": self.overruns,
+            "coalesced": self.coalesced,
+            "last_refresh": self.last_refresh,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics of every endpoint."""
+        return {endpoint: stats.as_dict() for endpoint, stats in self.endpoints.items()}
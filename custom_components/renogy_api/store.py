@@ -0,0 +1,99 @@
+"""Persistent storage for Renogy."""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+SNAPSHOT_SAVE_DELAY = 300
+
+
+class RenogyDatamapStore:
+    """Cache of device datamaps keyed by device id and firmware."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.datamap"
+        )
+        self._datamaps: dict[str, dict] = {}
+
+    async def async_load(self) -> None:
+        """Load cached datamaps from disk."""
+        self._datamaps = await self._store.async_load() or {}
+        _LOGGER.debug("Loaded %s cached datamap(s)", len(self._datamaps))
+
+    async def async_remove(self) -> None:
+        """Remove cached datamaps from disk."""
+        await self._store.async_remove()
+
+    def get(self, device_id: str, firmware: str) -> list | None:
+        """Return the cached datamap unless the firmware has changed."""
+        cached = self._datamaps.get(device_id)
+        if cached is None or cached["firmware"] != firmware:
+            return None
+        return cached["datamap"]
+
+    def cached(self, device_id: str) -> dict | None:
+        """Return the cached firmware and datamap, whatever the firmware."""
+        return self._datamaps.get(device_id)
+
+    def async_set(self, device_id: str, firmware: str, datamap: list) -> None:
+        """Cache a datamap and schedule it to be written to disk."""
+        self._datamaps[device_id] = {"firmware": firmware, "datamap": datamap}
+        self._store.async_delay_save(lambda: self._datamaps, SAVE_DELAY)
+
+
+class RenogySnapshotStore:
+    """Last known device list and readings, restored at startup."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._snapshot: dict = {}
+        self._pending = False
+
+    async def async_load(self) -> tuple[dict | None, dict | None]:
+        """Load the last known device list and readings from disk."""
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return None, None
+
+        devices = snapshot["devices"]
+        _LOGGER.debug("Loaded snapshot of %s device(s)", len(devices))
+        return snapshot["topology"], devices
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot from disk."""
+        await self._store.async_remove()
+
+    @callback
+    def async_save(self, topology: dict, devices: dict) -> None:
+        """Schedule the device list and readings to be written to disk."""
+        self._snapshot = {"topology": topology, "devices": devices}
+        if self._pending:
+            return
+        self._pending = True
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the latest snapshot for writing."""
+        self._pending = False
+        return {
+            "topology": self._snapshot["topology"],
+            "devices": {
+                device_id: device.as_dict()
+                for device_id, device in self._snapshot["devices"].items()
+            },
+        }
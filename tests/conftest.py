@@ -1,16 +1,56 @@
 """Provide common pytest fixtures."""
 
 import json
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+from aiohttp.test_utils import TestServer
 from aioresponses import aioresponses
 
+from custom_components.renogy.api import RenogyClient
+from custom_components.renogy.model import DeviceSnapshot
+
 from .common import load_fixture
 from .const import DUPE_SERIAL
+from .fake_api import FakeRenogyAPI
 
 BASE_URL = "https://openapi.renogy.com"
 DEVICE_LIST = "/device/list"
+PERF_BASELINE = Path(__file__).parent / "fixtures" / "perf_baseline.json"
+
+
+def pytest_addoption(parser):
+    """Add options for the performance benchmarks."""
+    parser.addoption(
+        "--perf", action="store_true", default=False, help="run performance tests"
+    )
+    parser.addoption(
+        "--perf-report",
+        default="perf-report.json",
+        help="where to write the performance report",
+    )
+    parser.addoption(
+        "--perf-update-baseline",
+        action="store_true",
+        default=False,
+        help="overwrite the performance baseline with this run",
+    )
+
+
+def pytest_configure(config):
+    """Register the perf marker."""
+    config.addinivalue_line("markers", "perf: performance test, run with --perf")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip performance tests unless --perf is given."""
+    if config.getoption("--perf"):
+        return
+    skip_perf = pytest.mark.skip(reason="need --perf option to run")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip_perf)
 
 
 # This fixture enables loading custom integrations in all tests.
@@ -33,6 +73,17 @@ def skip_notifications_fixture():
         yield
 
 
+# This fixture lifts the shared request rate limit so tests that refresh
+# repeatedly are not throttled. The limiter itself is tested directly.
+@pytest.fixture(name="skip_rate_limit", autouse=True)
+def skip_rate_limit_fixture():
+    """Skip request throttling."""
+    with patch("custom_components.renogy.limiter.RATE_LIMIT_BURST", 1000), patch(
+        "custom_components.renogy.limiter.RATE_LIMIT_RATE", 1000
+    ):
+        yield
+
+
 @pytest.fixture
 def mock_aioclient():
     """Fixture to mock aioclient calls."""
@@ -195,8 +246,14 @@ def mock_coord():
     """Mock charger data."""
     with patch(
         "custom_components.renogy.RenogyUpdateCoordinator._async_update_data"
-    ) as mock_value:
-        mock_value.return_value = DUPE_SERIAL
+    ) as mock_value, patch(
+        "custom_components.renogy.RenogyTopologyCoordinator._async_update_data"
+    ) as mock_topology:
+        mock_value.return_value = {
+            device_id: DeviceSnapshot.from_dict(device)
+            for device_id, device in DUPE_SERIAL.items()
+        }
+        mock_topology.return_value = DUPE_SERIAL
         yield
 
 
@@ -251,3 +308,40 @@ def mock_api_error(mock_aioclient):
         body=load_fixture("datamap3.json"),
         repeat=True,
     )
+
+
+@pytest.fixture(name="fake_api_server")
+async def fake_api_server_fixture(socket_enabled):
+    """Fixture to start local fakes of the Renogy cloud API."""
+    servers = []
+
+    async def _start(**kwargs) -> FakeRenogyAPI:
+        fake = FakeRenogyAPI(**kwargs)
+        server = TestServer(fake.app)
+        await server.start_server()
+        servers.append(server)
+        RenogyClient.base_url = str(server.make_url("")).rstrip("/")
+        return fake
+
+    with patch.object(RenogyClient, "base_url", RenogyClient.base_url):
+        yield _start
+
+    for server in servers:
+        await server.close()
+
+
+@pytest.fixture(name="perf_report", scope="session")
+def perf_report_fixture(request):
+    """Collect performance results and write the report at session end."""
+    baseline = json.loads(PERF_BASELINE.read_text()) if PERF_BASELINE.exists() else {}
+    report: dict = {}
+    yield baseline, report
+
+    if not report:
+        return
+    path = Path(request.config.getoption("--perf-report"))
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    if request.config.getoption("--perf-update-baseline"):
+        PERF_BASELINE.write_text(
+            json.dumps(baseline | report, indent=2, sort_keys=True) + "\n"
+        )
@@ -0,0 +1,218 @@
+"""Local stand-in for the Renogy cloud API, for load and latency testing.
+
+Serves /device/list, /device/data/latest/{id} and /device/datamap/{id} for a
+generated fleet of hubs and sub-devices, using the test fixtures as templates.
+
+Run standalone with::
+
+    python -m tests.fake_api --hubs 2 --devices 12 --latency 0.2 --rate-limit 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, deque
+
+from aiohttp import web
+
+from .common import load_fixture
+
+# (latest data fixture, datamap fixture, sku, connect type)
+TEMPLATES = (
+    ("realtime_data.json", "datamap.json", "RBT100LFP12SH-G1", "rs485"),
+    ("realtime_data_2.json", "datamap2.json", "RNG-CTRL-RVR40", "bt"),
+    ("realtime_data_inverter.json", "datamap3.json", "RINVTPGH110111S", "rs485"),
+)
+
+
+class FakeRenogyAPI:
+    """Fake Renogy cloud with configurable fleet size, latency and failures."""
+
+    def __init__(
+        self,
+        hubs: int = 1,
+        devices: int = 3,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: int | None = None,
+        retry_after: float = 1,
+        change_rate: float = 1.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize.
+
+        hubs and devices set the fleet size (devices is per hub). latency and
+        jitter are in seconds. error_rate and change_rate are probabilities
+        per request. rate_limit is the number of requests allowed per second
+        before answering 429 with the given retry_after.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.change_rate = change_rate
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._recent: deque[float] = deque()
+        self._templates = [
+            (json.loads(load_fixture(latest)), json.loads(load_fixture(datamap)))
+            for latest, datamap, _, _ in TEMPLATES
+        ]
+        self._device_list, self._device_templates = self._build_fleet(hubs, devices)
+
+        self.app = web.Application()
+        self.app.router.add_get("/device/list", self._handle_device_list)
+        self.app.router.add_get(
+            "/device/data/latest/{device_id}", self._handle_latest_data
+        )
+        self.app.router.add_get("/device/datamap/{device_id}", self._handle_datamap)
+
+    @property
+    def device_ids(self) -> list[str]:
+        """Return the ids of every hub and sub-device."""
+        return list(self._device_templates)
+
+    def _build_fleet(self, hubs: int, devices: int) -> tuple[list, dict]:
+        """Generate the device list and the template index of each device."""
+        device_list = []
+        device_templates: dict[str, int | None] = {}
+        for hub in range(hubs):
+            hub_id = str(1_000_000_000 + hub)
+            sublist = []
+            for index in range(devices):
+                device_id = str(10_000_000_000 + hub * 10_000 + index)
+                template = index % len(TEMPLATES)
+                _, _, sku, connect_type = TEMPLATES[template]
+                sublist.append(
+                    {
+                        "deviceId": device_id,
+                        "sn": "",
+                        "sku": sku,
+                        "name": f"{sku} {hub}-{index}",
+                        "category": sku,
+                        "mac": f"{hub}-{index}",
+                        "firmware": "",
+                        "onlineStatus": "online",
+                        "connectType": connect_type,
+                        "addTime": 1733682329000,
+                    }
+                )
+                device_templates[device_id] = template
+            device_list.append(
+                {
+                    "deviceId": hub_id,
+                    "sn": f"FAKESN{hub:04d}",
+                    "sku": "RSHGWSN-W02W-G1",
+                    "name": f"Renogy ONE Core {hub}",
+                    "category": "Renogy ONE Core",
+                    "mac": f"DE:AD:BE:EF:{hub // 256:02X}:{hub % 256:02X}",
+                    "firmware": "V1.1.157",
+                    "onlineStatus": "online",
+                    "connectType": "",
+                    "addTime": 1733682329000,
+                    "sublist": sublist or [{}],
+                }
+            )
+            device_templates[hub_id] = None
+        return device_list, device_templates
+
+    def _rate_limited(self) -> bool:
+        """Return True if this request is over the per-second limit."""
+        if self.rate_limit is None:
+            return False
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] >= 1:
+            self._recent.popleft()
+        if len(self._recent) >= self.rate_limit:
+            return True
+        self._recent.append(now)
+        return False
+
+    async def _respond(self, endpoint: str, payload) -> web.Response:
+        """Apply rate limiting, latency and errors, then send the payload."""
+        self.requests[endpoint] += 1
+        if self._rate_limited():
+            self.requests["rate_limited"] += 1
+            return web.json_response(
+                [], status=429, headers={"Retry-After": str(self.retry_after)}
+            )
+
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < self.error_rate:
+            self.requests["errors"] += 1
+            return web.json_response({"error": "Internal error"}, status=500)
+
+        return web.json_response(payload)
+
+    async def _handle_device_list(self, request: web.Request) -> web.Response:
+        """Return the generated device list."""
+        return await self._respond("device_list", self._device_list)
+
+    async def _handle_latest_data(self, request: web.Request) -> web.Response:
+        """Return latest readings, perturbed according to change_rate."""
+        device_id = request.match_info["device_id"]
+        if device_id not in self._device_templates:
+            return web.json_response({}, status=404)
+
+        template = self._device_templates[device_id]
+        if template is None:
+            return await self._respond("latest_data", {"data": {}})
+
+        latest = self._templates[template][0]
+        data = dict(latest["data"])
+        if self._random.random() < self.change_rate:
+            for key, value in data.items():
+                if isinstance(value, float):
+                    data[key] = round(value * self._random.uniform(0.95, 1.05), 3)
+        return await self._respond("latest_data", {**latest, "data": data})
+
+    async def _handle_datamap(self, request: web.Request) -> web.Response:
+        """Return the datamap of the device's template."""
+        device_id = request.match_info["device_id"]
+        template = self._device_templates.get(device_id)
+        if template is None:
+            return web.json_response({}, status=404)
+        return await self._respond("datamap", self._templates[template][1])
+
+
+def main() -> None:
+    """Run the fake API as a standalone server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--hubs", type=int, default=1)
+    parser.add_argument("--devices", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--retry-after", type=float, default=1)
+    parser.add_argument("--change-rate", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    fake = FakeRenogyAPI(
+        hubs=args.hubs,
+        devices=args.devices,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        change_rate=args.change_rate,
+        seed=args.seed,
+    )
+    web.run_app(fake.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
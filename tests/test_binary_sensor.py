@@ -8,6 +8,7 @@ from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAI
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.renogy import binary_sensor
 from custom_components.renogy.const import DOMAIN
 
 from .const import CONFIG_DATA
@@ -45,3 +46,22 @@ async def test_binary_sensors(hass, mock_api, caplog):
         state = hass.states.get("binary_sensor.rng_ctrl_rvr40_status")
         assert state
         assert state.state == "on"
+
+
+async def test_binary_sensors_created_once(hass, mock_api):
+    """Test keys reported as attribute and reading create one entity."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    with patch.object(
+        binary_sensor, "RenogyBinarySensor", wraps=binary_sensor.RenogyBinarySensor
+    ) as mock_binary_sensor:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_binary_sensor.call_count == 5
+    assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 5
@@ -0,0 +1,169 @@
+"""Test renogy circuit breaker."""
+
+import re
+
+import pytest
+from aiohttp import ClientConnectionError, ClientPayloadError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.renogy.api import RenogyClient
+from custom_components.renogy.breaker import RenogyCircuitBreaker
+from custom_components.renogy.const import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_THRESHOLD,
+    COORDINATOR,
+    DOMAIN,
+    MANAGER,
+)
+
+from .common import load_fixture
+from .conftest import BASE_URL, DEVICE_LIST
+from .const import CONFIG_DATA
+
+DEVICE_NAME = "Renogy Core"
+ALL_URLS = re.compile(rf"^{re.escape(BASE_URL)}/.*$")
+
+
+def test_breaker_transitions():
+    """Test the circuit opens after the threshold and closes after a probe."""
+    breaker = RenogyCircuitBreaker(threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow()
+    assert not breaker.allow(probe=True)
+
+    breaker.opened_at -= 60
+    assert not breaker.allow()
+    assert breaker.allow(probe=True)
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_breaker_failed_probe():
+    """Test a failed probe opens the circuit again straight away."""
+    breaker = RenogyCircuitBreaker(threshold=3, reset_timeout=60)
+    for _ in range(3):
+        breaker.record_failure()
+    breaker.opened_at -= 60
+    assert breaker.allow(probe=True)
+
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.probe_due
+
+
+def test_breaker_success_resets():
+    """Test only consecutive failures open the circuit."""
+    breaker = RenogyCircuitBreaker(threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+
+
+@pytest.mark.asyncio
+async def test_circuit_open_serves_stale(hass, mock_api, mock_aioclient):
+    """Test an outage stops requests and keeps the last readings available."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    breaker = hass.data[DOMAIN][entry.entry_id][MANAGER].breaker
+    mock_aioclient.clear()
+    mock_aioclient.get(ALL_URLS, exception=ClientConnectionError(), repeat=True)
+
+    # One refresh fails outright, the next one trips the breaker
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert breaker.state == BREAKER_OPEN
+    assert coordinator.last_update_success
+    assert coordinator.data["12345678903"].stale
+    state = hass.states.get("sensor.rbt100lfp12sh_g1_battery_level")
+    assert state.state == "54.784637"
+    state = hass.states.get("sensor.renogy_one_core_api_circuit_breaker")
+    assert state.state == BREAKER_OPEN
+
+    # No requests while the circuit is open
+    requests = sum(len(calls) for calls in mock_aioclient.requests.values())
+    await coordinator.async_refresh()
+    assert sum(len(calls) for calls in mock_aioclient.requests.values()) == requests
+
+    # The device list probe fails, so the circuit stays open
+    breaker.opened_at -= BREAKER_RESET_TIMEOUT
+    await coordinator.async_refresh()
+    assert breaker.state == BREAKER_OPEN
+    assert sum(len(calls) for calls in mock_aioclient.requests.values()) == (
+        requests + 1
+    )
+
+    mock_aioclient.clear()
+    mock_aioclient.get(
+        BASE_URL + DEVICE_LIST,
+        status=200,
+        body=load_fixture("device_list.json"),
+        repeat=True,
+    )
+    mock_aioclient.get(
+        ALL_URLS, status=200, body=load_fixture("realtime_data.json"), repeat=True
+    )
+    breaker.opened_at -= BREAKER_RESET_TIMEOUT
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert breaker.state == BREAKER_CLOSED
+    assert not coordinator.data["12345678903"].stale
+    state = hass.states.get("sensor.renogy_one_core_api_circuit_breaker")
+    assert state.state == BREAKER_CLOSED
+
+
+@pytest.mark.asyncio
+async def test_probe_payload_error(hass, mock_aioclient):
+    """Test a probe that fails without an answer opens the circuit again."""
+    client = RenogyClient(
+        secret_key=CONFIG_DATA["secret_key"],
+        access_key=CONFIG_DATA["access_key"],
+        session=async_get_clientsession(hass),
+    )
+    breaker = client.breaker
+    for _ in range(BREAKER_THRESHOLD):
+        breaker.record_failure()
+    breaker.opened_at -= BREAKER_RESET_TIMEOUT
+    mock_aioclient.get(
+        BASE_URL + DEVICE_LIST, exception=ClientPayloadError("Truncated body")
+    )
+
+    with pytest.raises(ClientPayloadError):
+        await client.get_device_list()
+    assert breaker.state == BREAKER_OPEN
+
+    # The next probe is let through once the reset timeout has passed again
+    breaker.opened_at -= BREAKER_RESET_TIMEOUT
+    mock_aioclient.get(
+        BASE_URL + DEVICE_LIST, status=200, body=load_fixture("device_list.json")
+    )
+    assert await client.get_device_list()
+    assert breaker.state == BREAKER_CLOSED
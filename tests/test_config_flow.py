@@ -1,6 +1,7 @@
 """Test renogy config flow."""
 
 import logging
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
@@ -11,10 +12,17 @@ from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.renogy.const import (
+    COORDINATOR,
     DOMAIN,
     CONF_ACCESS_KEY,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MAX_CONCURRENT,
+    CONF_REFRESH_DEADLINE,
     CONF_NAME,
+    CONF_SCAN_INTERVAL,
     CONF_SECRET_KEY,
+    CONF_STAGGERED_POLLING,
+    DEFAULT_REFRESH_DEADLINE,
 )
 
 from .const import CONFIG_DATA
@@ -564,7 +572,7 @@ async def test_form_config_api_error(
         "custom_components.renogy.async_setup_entry",
         return_value=True,
     ) as mock_setup_entry, patch(
-        "custom_components.renogy.config_flow.api.get_devices"
+        "custom_components.renogy.config_flow.RenogyClient.get_device_list"
     ) as mock_api_error:
         mock_api_error.side_effect = Exception("General Error")
         result = await hass.config_entries.flow.async_configure(
@@ -604,7 +612,7 @@ async def test_form_reconfigure_api_error(
 ):
     """Test we get the form."""
     with caplog.at_level(logging.DEBUG), patch(
-        "custom_components.renogy.config_flow.api.get_devices"
+        "custom_components.renogy.config_flow.RenogyClient.get_device_list"
     ) as mock_api_error:
         mock_api_error.side_effect = Exception("General Error")
         await setup.async_setup_component(hass, "persistent_notification", {})
@@ -634,3 +642,41 @@ async def test_form_reconfigure_api_error(
         assert result["type"] is FlowResultType.FORM
         assert result["step_id"] == step_id
         assert result["errors"] == {CONF_NAME: "general"}
+
+
+async def test_options_flow(hass, mock_api):
+    """Test the polling options can be changed."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_SCAN_INTERVAL: 60,
+            CONF_ADAPTIVE_POLLING: True,
+            CONF_MAX_CONCURRENT: 2,
+        },
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+
+    assert entry.options == {
+        CONF_SCAN_INTERVAL: 60,
+        CONF_ADAPTIVE_POLLING: True,
+        CONF_MAX_CONCURRENT: 2,
+        CONF_REFRESH_DEADLINE: DEFAULT_REFRESH_DEADLINE,
+        CONF_STAGGERED_POLLING: False,
+    }
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    assert coordinator.update_interval == timedelta(seconds=60)
+    assert coordinator.deadline == 48
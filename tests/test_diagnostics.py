@@ -4,6 +4,7 @@ from unittest.mock import patch
 
 import pytest
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
+from homeassistant.helpers import device_registry as dr
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.renogy.const import DOMAIN, CONF_SECRET_KEY, CONF_ACCESS_KEY
@@ -46,6 +47,29 @@ async def test_device_diagnostics(hass, mock_api):
     assert await hass.config_entries.async_setup(entry.entry_id)
     await hass.async_block_till_done()
 
-    result = await async_get_device_diagnostics(hass, entry, None)
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "12345678903")})
+    result = await async_get_device_diagnostics(hass, entry, device)
 
-    assert result == DIAG_RESULTS
+    assert result["device"] == DIAG_RESULTS["12345678903"] | {"mac": "**REDACTED**"}
+    assert result["datamap"]["firmware"] == DIAG_RESULTS["12345678903"]["firmware"]
+    assert len(result["datamap"]["datamap"]) > 0
+    assert result["requests"]["payload_bytes"] > 0
+    assert [request["endpoint"] for request in result["requests"]["recent"]] == [
+        "latest_data",
+        "datamap",
+    ]
+
+    hub = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "1234567890")})
+    result = await async_get_device_diagnostics(hass, entry, hub)
+
+    assert result["device"]["serial"] == "**REDACTED**"
+    assert result["datamap"] is None
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert result["requests"]["device_list"]["requests"] == 1
+    assert result["requests"]["latest_data"]["requests"] == 4
+    assert result["devices"].keys() == DIAG_RESULTS.keys()
+    assert result["devices"]["12345678903"]["datamap_cached"] is True
+    assert result["devices"]["12345678903"]["payload_bytes"] > 0
+    assert result["devices"]["1234567890"]["readings"] == 0
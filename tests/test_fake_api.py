@@ -0,0 +1,56 @@
+"""Test the local fake of the Renogy cloud API."""
+
+import pytest
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from renogyapi.exceptions import RateLimit
+
+from custom_components.renogy.api import RenogyClient
+from custom_components.renogy.const import DOMAIN
+from custom_components.renogy.limiter import RenogyRateLimiter
+
+from .const import CONFIG_DATA
+
+pytestmark = pytest.mark.asyncio
+
+DEVICE_NAME = "Renogy Core"
+
+
+async def test_fake_api_fleet(hass, fake_api_server):
+    """Test the integration polls a generated fleet."""
+    fake = await fake_api_server(hubs=2, devices=4, seed=1)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert len(fake.device_ids) == 10
+    assert fake.requests["device_list"] == 1
+    assert fake.requests["latest_data"] == 10
+    assert fake.requests["datamap"] == 8
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) > 10
+
+
+async def test_fake_api_rate_limit(hass, fake_api_server):
+    """Test the fake API answers 429 with Retry-After over its limit."""
+    fake = await fake_api_server(rate_limit=1, retry_after=0.1)
+    limiter = RenogyRateLimiter(rate=50, burst=10)
+    client = RenogyClient(
+        secret_key=CONFIG_DATA["secret_key"],
+        access_key=CONFIG_DATA["access_key"],
+        session=async_get_clientsession(hass),
+        limiter=limiter,
+    )
+
+    await client.get_device_list()
+    with pytest.raises(RateLimit) as error:
+        await client.get_device_list()
+
+    assert error.value.args == (0.1,)
+    assert fake.requests["rate_limited"] == 1
@@ -1,17 +1,48 @@
 """Test renogy setup process."""
 
+import asyncio
+import json
 import logging
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
+from aiohttp import ClientError
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.helpers import device_registry as dr
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from renogyapi.exceptions import RateLimit
+from yarl import URL
 
-from custom_components.renogy.const import DOMAIN
+from custom_components.renogy import async_update_device_registry
+from custom_components.renogy.api import REQUEST_TIMEOUT, RenogyClient
+from custom_components.renogy.const import (
+    ADAPTIVE_IDLE_CYCLES,
+    BREAKER_CLOSED,
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_THRESHOLD,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MAX_CONCURRENT,
+    CONF_REFRESH_DEADLINE,
+    CONF_SCAN_INTERVAL,
+    CONF_STAGGERED_POLLING,
+    COORDINATOR,
+    DOMAIN,
+    MANAGER,
+    OFFLINE_PROBE_INTERVAL,
+    TOPOLOGY_COORDINATOR,
+)
 
-from .const import CONFIG_DATA
+from .common import load_fixture
+from .conftest import BASE_URL, DEVICE_LIST
+from .const import CONFIG_DATA, DIAG_RESULTS
 
 pytestmark = pytest.mark.asyncio
 
@@ -32,7 +63,7 @@ async def test_setup_entry(hass, mock_api, device_registry: dr.DeviceRegistry, c
         await hass.async_block_till_done()
 
         assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 5
-        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 40
+        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 41
         entries = hass.config_entries.async_entries(DOMAIN)
         assert len(entries) == 1
 
@@ -51,14 +82,14 @@ async def test_setup_and_unload_entry(hass, mock_api, caplog):
         await hass.async_block_till_done()
 
         assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 5
-        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 40
+        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 41
         entries = hass.config_entries.async_entries(DOMAIN)
         assert len(entries) == 1
 
         assert await hass.config_entries.async_unload(entries[0].entry_id)
         await hass.async_block_till_done()
         assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 5
-        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 40
+        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 41
         assert len(hass.states.async_entity_ids(DOMAIN)) == 0
 
         assert await hass.config_entries.async_remove(entries[0].entry_id)
@@ -83,6 +114,805 @@ async def test_duplicate_serials(
         await hass.async_block_till_done()
 
         assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 6
-        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 19
+        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 20
         entries = hass.config_entries.async_entries(DOMAIN)
         assert len(entries) == 1
+
+
+async def test_concurrent_device_fetch(hass, mock_api):
+    """Test device data is fetched concurrently within the configured bound."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+        options={CONF_MAX_CONCURRENT: 2},
+    )
+    in_flight = 0
+    peak = 0
+
+    async def mock_latest_data(device_id, timeout=REQUEST_TIMEOUT):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return {}
+
+    with patch(
+        "custom_components.renogy.api.RenogyClient.get_latest_data",
+        side_effect=mock_latest_data,
+    ) as mock_data:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_data.call_count == 4
+        assert peak == 2
+
+
+async def test_datamap_cached(hass, mock_api, mock_aioclient):
+    """Test datamaps are fetched once and reused on later refreshes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    await coordinator.async_refresh()
+
+    datamap_url = URL(f"{BASE_URL}/device/datamap/12345678903")
+    latest_url = URL(f"{BASE_URL}/device/data/latest/12345678903")
+    assert len(mock_aioclient.requests[("GET", datamap_url)]) == 1
+    assert len(mock_aioclient.requests[("GET", latest_url)]) == 2
+    assert coordinator.data["12345678903"].reading("batteryLevel") == 54.784637
+    assert coordinator.data["12345678903"].unit("batteryLevel") == "%"
+
+
+async def test_datamap_restored(hass, hass_storage, mock_api, mock_aioclient):
+    """Test cached datamaps survive a restart until the firmware changes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+    datamap = json.loads(load_fixture("datamap3.json"))
+    hass_storage[f"{DOMAIN}.{entry.entry_id}.datamap"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}.datamap",
+        "data": {
+            "12345678901": {"firmware": "0100.0102.0202", "datamap": datamap},
+            "12345678903": {"firmware": "V0.0.1", "datamap": []},
+        },
+    }
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert ("GET", URL(f"{BASE_URL}/device/datamap/12345678901")) not in (
+        mock_aioclient.requests
+    )
+    assert ("GET", URL(f"{BASE_URL}/device/datamap/12345678903")) in (
+        mock_aioclient.requests
+    )
+
+
+async def test_topology_refreshed_separately(hass, mock_api, mock_aioclient):
+    """Test telemetry refreshes do not refetch the device list."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    topology = hass.data[DOMAIN][entry.entry_id][TOPOLOGY_COORDINATOR]
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    device_list_url = URL(BASE_URL + DEVICE_LIST)
+    latest_url = URL(f"{BASE_URL}/device/data/latest/12345678903")
+    assert len(mock_aioclient.requests[("GET", device_list_url)]) == 1
+    assert len(mock_aioclient.requests[("GET", latest_url)]) == 3
+
+    await topology.async_refresh()
+    assert len(mock_aioclient.requests[("GET", device_list_url)]) == 2
+
+
+async def test_adaptive_polling(hass, mock_api):
+    """Test the interval backs off while idle and resets on change."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+        options={CONF_SCAN_INTERVAL: 30, CONF_ADAPTIVE_POLLING: True},
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    for _ in range(ADAPTIVE_IDLE_CYCLES):
+        await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    with patch(
+        "custom_components.renogy.api.RenogyClient.get_latest_data",
+        side_effect=RateLimit,
+    ):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.update_interval == timedelta(seconds=120)
+
+    with patch(
+        "custom_components.renogy.api.RenogyClient.get_latest_data",
+        side_effect=lambda device_id, timeout: (
+            {} if device_id == "1234567890" else {"soc": 42}
+        ),
+    ):
+        await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=30)
+
+
+async def test_staggered_polling(hass, mock_api, mock_aioclient):
+    """Test devices are polled round-robin in slots across the interval."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+        options={CONF_SCAN_INTERVAL: 30, CONF_STAGGERED_POLLING: True},
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    def polled():
+        return {
+            url.path.rsplit("/", 1)[1]: len(calls)
+            for (method, url), calls in mock_aioclient.requests.items()
+            if "/device/data/latest/" in url.path
+        }
+
+    # Devices without readings are all polled by the first refresh
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    assert set(polled().values()) == {1}
+    assert coordinator.update_interval == timedelta(seconds=7.5)
+    # A hung device may only hold up its own slot
+    assert coordinator.deadline == 6
+
+    await coordinator.async_refresh()
+    assert sum(polled().values()) == 5
+    assert polled()["12345678901"] == 2
+    # Only latest data requests are held to the slot, not the device list
+    timeouts = {
+        url.path: calls[-1].kwargs["timeout"]
+        for (method, url), calls in mock_aioclient.requests.items()
+    }
+    assert timeouts["/device/data/latest/12345678901"].total == 6
+    assert timeouts[DEVICE_LIST] == REQUEST_TIMEOUT
+
+    for _ in range(3):
+        await coordinator.async_refresh()
+    assert set(polled().values()) == {2}
+    assert len(coordinator.data) == 4
+
+
+async def test_staggered_short_slots(hass, fake_api_server):
+    """Test slots shorter than the cloud's latency leave the device list alone."""
+    fake = await fake_api_server(hubs=2, devices=4, seed=1)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+        options={
+            CONF_SCAN_INTERVAL: 5,
+            CONF_STAGGERED_POLLING: True,
+            CONF_REFRESH_DEADLINE: 25,
+        },
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    topology = hass.data[DOMAIN][entry.entry_id][TOPOLOGY_COORDINATOR]
+    breaker = hass.data[DOMAIN][entry.entry_id][MANAGER].breaker
+    # More devices than seconds in the interval, so each slot is short
+    assert len(fake.device_ids) > 5
+    assert coordinator.deadline == 0.25
+
+    fake.latency = 0.4
+    await topology.async_refresh()
+    assert topology.last_update_success
+
+    # The breaker probe is a device list request too
+    for _ in range(BREAKER_THRESHOLD):
+        breaker.record_failure()
+    breaker.opened_at -= BREAKER_RESET_TIMEOUT
+    await topology.async_refresh()
+    assert topology.last_update_success
+    assert breaker.state == BREAKER_CLOSED
+
+
+async def test_shared_session(hass, mock_api):
+    """Test the client reuses Home Assistant's shared session."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    assert manager._session is async_get_clientsession(hass)
+
+
+async def test_new_device_discovered(
+    hass, mock_api, mock_aioclient, device_registry: dr.DeviceRegistry
+):
+    """Test devices added to the hub get entities without a reload."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 41
+
+    mock_aioclient.get(
+        f"{BASE_URL}/device/data/latest/12345678904",
+        status=200,
+        body=load_fixture("realtime_data.json"),
+        repeat=True,
+    )
+    mock_aioclient.get(
+        f"{BASE_URL}/device/datamap/12345678904",
+        status=200,
+        body=load_fixture("datamap.json"),
+        repeat=True,
+    )
+    topology = hass.data[DOMAIN][entry.entry_id][TOPOLOGY_COORDINATOR]
+    devices = dict(topology.data)
+    devices["12345678904"] = {
+        **devices["12345678903"],
+        "deviceId": "12345678904",
+        "name": "Second Battery",
+        "mac": "49",
+    }
+    topology.async_set_updated_data(devices)
+    await hass.async_block_till_done()
+
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "12345678904")})
+    assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 7
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 48
+    state = hass.states.get("sensor.second_battery_battery_level")
+    assert state
+    assert state.state == "54.784637"
+
+
+async def test_snapshot_saved(hass, hass_storage, mock_api):
+    """Test the last known data is written for the next startup."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    await coordinator.async_refresh()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=301))
+    await hass.async_block_till_done()
+
+    snapshot = hass_storage[f"{DOMAIN}.{entry.entry_id}.snapshot"]["data"]
+    assert set(snapshot["topology"]) == set(DIAG_RESULTS)
+    assert snapshot["devices"]["12345678903"]["data"]["batteryLevel"] == [
+        54.784637,
+        "%",
+    ]
+
+
+async def test_snapshot_restored(hass, hass_storage, mock_api_not_found):
+    """Test entities are set up from the snapshot while the cloud is down."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+    devices = {
+        device_id: {
+            **device,
+            "data": {
+                key: list(value) if isinstance(value, tuple) else value
+                for key, value in device["data"].items()
+            },
+        }
+        for device_id, device in DIAG_RESULTS.items()
+    }
+    hass_storage[f"{DOMAIN}.{entry.entry_id}.snapshot"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}.snapshot",
+        "data": {"topology": devices, "devices": devices},
+    }
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 5
+    assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 41
+    topology = hass.data[DOMAIN][entry.entry_id][TOPOLOGY_COORDINATOR]
+    assert not topology.last_update_success
+    state = hass.states.get("sensor.rbt100lfp12sh_g1_battery_level")
+    assert state
+    assert state.state == "54.784637"
+    assert state.attributes["unit_of_measurement"] == "%"
+
+
+async def test_restored_refresh_jittered(hass, hass_storage, mock_api, caplog):
+    """Test the first live refresh after a restore is jittered."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+    devices = {
+        device_id: {
+            **device,
+            "data": {
+                key: list(value) if isinstance(value, tuple) else value
+                for key, value in device["data"].items()
+            },
+        }
+        for device_id, device in DIAG_RESULTS.items()
+    }
+    hass_storage[f"{DOMAIN}.{entry.entry_id}.snapshot"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}.snapshot",
+        "data": {"topology": devices, "devices": devices},
+    }
+
+    entry.add_to_hass(hass)
+    with (
+        caplog.at_level(logging.DEBUG),
+        patch(
+            "custom_components.renogy.limiter.RenogyRateLimiter.start_jitter",
+            return_value=0.01,
+        ),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert "Delaying first scheduled refresh by 0.0s" in caplog.text
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    assert coordinator.start_jitter == 0.0
+
+
+async def test_device_registry_unchanged(
+    hass, mock_api, device_registry: dr.DeviceRegistry
+):
+    """Test registry entries are only written when the device list changes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    topology = hass.data[DOMAIN][entry.entry_id][TOPOLOGY_COORDINATOR]
+    devices = {device_id: dict(device) for device_id, device in topology.data.items()}
+    with patch.object(
+        device_registry,
+        "async_get_or_create",
+        wraps=device_registry.async_get_or_create,
+    ) as mock_create:
+        async_update_device_registry(hass, entry, devices)
+        assert mock_create.call_count == 0
+
+        devices["12345678901"]["firmware"] = "0100.0102.0203"
+        async_update_device_registry(hass, entry, devices)
+        assert mock_create.call_count == 1
+
+    device = device_registry.async_get_device(identifiers={(DOMAIN, "12345678901")})
+    assert device.sw_version == "0100.0102.0203"
+    assert device.via_device_id == (
+        device_registry.async_get_device(identifiers={(DOMAIN, "1234567890")}).id
+    )
+
+
+async def test_offline_device_skipped(hass, mock_api, mock_aioclient):
+    """Test offline devices keep their readings and are probed slowly."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    topology = hass.data[DOMAIN][entry.entry_id][TOPOLOGY_COORDINATOR]
+    devices = {device_id: dict(device) for device_id, device in topology.data.items()}
+    devices["12345678903"]["status"] = "offline"
+    topology.async_set_updated_data(devices)
+    latest_url = URL(f"{BASE_URL}/device/data/latest/12345678903")
+
+    # Going offline probes once, then later refreshes skip the device
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(mock_aioclient.requests[("GET", latest_url)]) == 2
+    assert coordinator.data["12345678903"].reading("batteryLevel") == 54.784637
+    state = hass.states.get("sensor.rbt100lfp12sh_g1_battery_level")
+    assert state.state == "unavailable"
+    state = hass.states.get("binary_sensor.rbt100lfp12sh_g1_status")
+    assert state.state == "off"
+
+    coordinator._probed["12345678903"] -= OFFLINE_PROBE_INTERVAL
+    await coordinator.async_refresh()
+    assert len(mock_aioclient.requests[("GET", latest_url)]) == 3
+
+    devices = {device_id: dict(device) for device_id, device in topology.data.items()}
+    devices["12345678903"]["status"] = "online"
+    topology.async_set_updated_data(devices)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(mock_aioclient.requests[("GET", latest_url)]) == 4
+    state = hass.states.get("sensor.rbt100lfp12sh_g1_battery_level")
+    assert state.state == "54.784637"
+
+
+async def test_device_failure_isolated(hass, mock_api):
+    """Test a failing device only affects its own entities and backs off."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    get_latest_data = RenogyClient.get_latest_data
+    calls = []
+
+    async def broken_controller(self, device_id, timeout=REQUEST_TIMEOUT):
+        if device_id == "12345678902":
+            calls.append(device_id)
+            raise ClientError("Controller unreachable")
+        return await get_latest_data(self, device_id, timeout)
+
+    with patch.object(RenogyClient, "get_latest_data", broken_controller):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert coordinator.last_update_success
+        assert hass.states.get("sensor.rng_ctrl_rvr40_state_of_charge").state == (
+            "unavailable"
+        )
+        assert hass.states.get("sensor.rbt100lfp12sh_g1_battery_level").state == (
+            "54.784637"
+        )
+        assert coordinator.data["12345678902"].reading("soc") is not None
+
+        # Retried on the next refresh, then skips one refresh after failing again
+        for _ in range(3):
+            await coordinator.async_refresh()
+        assert len(calls) == 3
+
+    # The third failure skips three refreshes before the device is tried again
+    for _ in range(4):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.rng_ctrl_rvr40_state_of_charge").state != (
+        "unavailable"
+    )
+
+    with patch.object(
+        RenogyClient, "get_latest_data", side_effect=ClientError("Cloud down")
+    ):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+
+async def test_rate_limited_device_stale(hass, mock_api):
+    """Test a rate limited device keeps its readings available as stale."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    get_latest_data = RenogyClient.get_latest_data
+
+    async def rate_limited_battery(self, device_id, timeout=REQUEST_TIMEOUT):
+        if device_id == "12345678903":
+            raise RateLimit
+        return await get_latest_data(self, device_id, timeout)
+
+    with patch.object(RenogyClient, "get_latest_data", rate_limited_battery):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    battery = coordinator.data["12345678903"]
+    assert battery.stale
+    assert not battery.failed
+    assert "12345678903" not in coordinator._failures
+    assert hass.states.get("sensor.rbt100lfp12sh_g1_battery_level").state == (
+        "54.784637"
+    )
+
+
+async def test_device_error_response(hass, mock_api, mock_aioclient):
+    """Test an error response keeps the device's readings and backs off."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    mock_aioclient.clear()
+    mock_aioclient.get(
+        BASE_URL + DEVICE_LIST,
+        status=200,
+        body=load_fixture("device_list.json"),
+        repeat=True,
+    )
+    for device_id, status, body in (
+        ("1234567890", 200, ""),
+        ("12345678901", 200, load_fixture("realtime_data_inverter.json")),
+        ("12345678902", 500, json.dumps({"message": "Internal error"})),
+        ("12345678903", 200, load_fixture("realtime_data.json")),
+    ):
+        mock_aioclient.get(
+            f"{BASE_URL}/device/data/latest/{device_id}",
+            status=status,
+            body=body,
+            repeat=True,
+        )
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.last_update_success
+    controller = coordinator.data["12345678902"]
+    assert controller.failed
+    assert controller.reading("soc") is not None
+    assert "12345678902" in coordinator._failures
+    assert hass.states.get("sensor.rng_ctrl_rvr40_state_of_charge").state == (
+        "unavailable"
+    )
+    assert hass.states.get("sensor.rbt100lfp12sh_g1_battery_level").state == (
+        "54.784637"
+    )
+
+
+async def test_recovery_updates_all_entities(hass, mock_api):
+    """Test entities become available again once a failed refresh recovers."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    with patch.object(
+        RenogyClient, "get_latest_data", side_effect=ClientError("Cloud down")
+    ):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert not coordinator.last_update_success
+    binary_sensors = hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)
+    assert len(binary_sensors) == 5
+    assert all(
+        hass.states.get(entity_id).state == "unavailable"
+        for entity_id in binary_sensors
+    )
+
+    # The readings match the ones from before the failure
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.last_update_success
+    assert not any(
+        hass.states.get(entity_id).state == "unavailable"
+        for entity_id in binary_sensors
+    )
+
+
+async def test_refresh_deadline(hass, mock_api):
+    """Test devices that miss the deadline keep their readings as stale."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    assert coordinator.deadline == 24
+    coordinator.deadline = 0.05
+    get_latest_data = RenogyClient.get_latest_data
+
+    async def hung_battery(self, device_id, timeout=REQUEST_TIMEOUT):
+        if device_id == "12345678903":
+            await asyncio.sleep(3600)
+        return await get_latest_data(self, device_id, timeout)
+
+    with patch.object(RenogyClient, "get_latest_data", hung_battery):
+        await asyncio.wait_for(coordinator.async_refresh(), 5)
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    assert coordinator.data["12345678903"].stale
+    assert not coordinator.data["12345678902"].stale
+    assert hass.states.get("sensor.rbt100lfp12sh_g1_battery_level").state == (
+        "54.784637"
+    )
+
+    await coordinator.async_refresh()
+    assert not coordinator.data["12345678903"].stale
+
+
+async def test_refresh_coalesced(hass, mock_api):
+    """Test a refresh requested mid-cycle shares the one in flight."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    stats = hass.data[DOMAIN][entry.entry_id][MANAGER].stats
+    get_latest_data = RenogyClient.get_latest_data
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_cloud(self, device_id, timeout=REQUEST_TIMEOUT):
+        calls.append(device_id)
+        await release.wait()
+        return await get_latest_data(self, device_id, timeout)
+
+    updates = []
+    coordinator.async_add_listener(lambda: updates.append(None))
+    coordinator.update_interval = timedelta(milliseconds=10)
+    with patch.object(RenogyClient, "get_latest_data", slow_cloud):
+        first = hass.async_create_task(coordinator.async_refresh())
+        await asyncio.sleep(0.05)
+        second = hass.async_create_task(coordinator.async_refresh())
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second)
+
+    assert len(calls) == 4
+    assert len(updates) == 1
+    assert coordinator.last_update_success
+    assert stats.coalesced == 1
+    assert stats.overruns == 1
+    assert stats.refresh_dict()["last_refresh"] >= 0.05
+
+
+async def test_jittered_refresh_coalesced(hass, mock_api):
+    """Test a refresh requested during the start jitter shares the delayed one."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    stats = hass.data[DOMAIN][entry.entry_id][MANAGER].stats
+    get_latest_data = RenogyClient.get_latest_data
+    calls = []
+
+    async def counted(self, device_id, timeout=REQUEST_TIMEOUT):
+        calls.append(device_id)
+        return await get_latest_data(self, device_id, timeout)
+
+    coordinator.start_jitter = 0.05
+    with patch.object(RenogyClient, "get_latest_data", counted):
+        first = hass.async_create_task(coordinator.async_refresh())
+        await asyncio.sleep(0)
+        second = hass.async_create_task(coordinator.async_refresh())
+        await asyncio.gather(first, second)
+
+    assert len(calls) == 4
+    assert coordinator.last_update_success
+    assert stats.coalesced == 1
+    assert stats.refresh_dict()["last_refresh"] < 0.05
+
+
+async def test_device_refresh_requested(hass, mock_api, mock_aioclient):
+    """Test updating an entity polls its device even while it is skipped."""
+    assert await async_setup_component(hass, "homeassistant", {})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    topology = hass.data[DOMAIN][entry.entry_id][TOPOLOGY_COORDINATOR]
+    devices = {device_id: dict(device) for device_id, device in topology.data.items()}
+    devices["12345678903"]["status"] = "offline"
+    topology.async_set_updated_data(devices)
+    latest_url = URL(f"{BASE_URL}/device/data/latest/12345678903")
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert len(mock_aioclient.requests[("GET", latest_url)]) == 2
+
+    def latest_requests():
+        return sum(
+            len(calls)
+            for (method, url), calls in mock_aioclient.requests.items()
+            if "/device/data/latest/" in url.path
+        )
+
+    requests = latest_requests()
+    await hass.services.async_call(
+        "homeassistant",
+        "update_entity",
+        {"entity_id": "sensor.rbt100lfp12sh_g1_battery_level"},
+        blocking=True,
+    )
+    assert len(mock_aioclient.requests[("GET", latest_url)]) == 3
+    # The other devices wait for the next scheduled refresh
+    assert latest_requests() == requests + 1
+
+    # Only the requested refresh polls the device
+    await coordinator.async_refresh()
+    assert len(mock_aioclient.requests[("GET", latest_url)]) == 3
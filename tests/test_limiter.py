@@ -0,0 +1,118 @@
+"""Test renogy rate limiting."""
+
+import asyncio
+import time
+
+import pytest
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from renogyapi.exceptions import RateLimit
+
+from custom_components.renogy.api import RenogyClient
+from custom_components.renogy.const import (
+    DOMAIN,
+    MANAGER,
+    RATE_LIMIT_BACKOFF,
+    RATE_LIMITERS,
+)
+from custom_components.renogy.limiter import RenogyRateLimiter
+
+from .conftest import BASE_URL, DEVICE_LIST
+from .const import CONFIG_DATA
+
+pytestmark = pytest.mark.asyncio
+
+DEVICE_NAME = "Renogy Core"
+
+
+async def test_token_bucket():
+    """Test requests beyond the burst wait for tokens to refill."""
+    limiter = RenogyRateLimiter(rate=50, burst=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        await limiter.acquire()
+
+    assert time.monotonic() - start >= 0.03
+
+
+async def test_back_off():
+    """Test requests are held after a rate limit."""
+    limiter = RenogyRateLimiter(rate=50, burst=10)
+    limiter.back_off(0.05)
+
+    start = time.monotonic()
+    await limiter.acquire()
+
+    assert time.monotonic() - start >= 0.05
+
+
+async def test_shared_limiter(hass, mock_api):
+    """Test entries using the same access key share one limiter."""
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=f"{DEVICE_NAME} {index}",
+            data=CONFIG_DATA,
+        )
+        for index in range(2)
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    limiters = hass.data[DOMAIN][RATE_LIMITERS]
+    assert len(limiters) == 1
+    limiter = limiters[CONFIG_DATA["access_key"]]
+    assert limiter.entries == {entry.entry_id for entry in entries}
+    for entry in entries:
+        assert hass.data[DOMAIN][entry.entry_id][MANAGER].limiter is limiter
+    assert 0 <= limiter.start_jitter() <= 10
+
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    assert limiter.entries == {entries[1].entry_id}
+    await hass.config_entries.async_unload(entries[1].entry_id)
+    assert not limiters
+
+
+async def test_rate_limit_holds_requests(mock_api_rate_limit):
+    """Test a rate limited response holds further requests."""
+    limiter = RenogyRateLimiter(rate=50, burst=10)
+    client = RenogyClient(
+        secret_key=CONFIG_DATA["secret_key"],
+        access_key=CONFIG_DATA["access_key"],
+        limiter=limiter,
+    )
+
+    with pytest.raises(RateLimit):
+        await client.get_device_list()
+
+    with pytest.raises(asyncio.TimeoutError):
+        async with asyncio.timeout(0.05):
+            await limiter.acquire()
+
+
+async def test_retry_after(hass, mock_aioclient):
+    """Test the Retry-After header sets how long requests are held."""
+    mock_aioclient.get(
+        BASE_URL + DEVICE_LIST,
+        status=429,
+        body="[]",
+        headers={"Retry-After": "0.1"},
+    )
+    limiter = RenogyRateLimiter(rate=50, burst=10)
+    client = RenogyClient(
+        secret_key=CONFIG_DATA["secret_key"],
+        access_key=CONFIG_DATA["access_key"],
+        session=async_get_clientsession(hass),
+        limiter=limiter,
+    )
+
+    with pytest.raises(RateLimit):
+        await client.get_device_list()
+
+    start = time.monotonic()
+    await limiter.acquire()
+
+    assert 0.05 <= time.monotonic() - start < RATE_LIMIT_BACKOFF
@@ -0,0 +1,98 @@
+"""Test renogy device snapshots."""
+
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.renogy.api import REQUEST_TIMEOUT, RenogyClient
+from custom_components.renogy.const import COORDINATOR, DOMAIN, MANAGER
+from custom_components.renogy.model import DeviceSnapshot, ReadingPosition
+
+from .const import CONFIG_DATA, DIAG_RESULTS
+
+pytestmark = pytest.mark.asyncio
+
+DEVICE_NAME = "Renogy Core"
+
+
+async def test_snapshot_round_trip():
+    """Test snapshots convert to and from the device dict layout."""
+    for device in DIAG_RESULTS.values():
+        snapshot = DeviceSnapshot.from_dict(device)
+        assert snapshot.as_dict() == device
+
+    snapshot = DeviceSnapshot.from_dict(DIAG_RESULTS["12345678903"])
+    assert snapshot.reading("batteryLevel") == 54.784637
+    assert snapshot.unit("batteryLevel") == "%"
+    assert snapshot.reading("missing", "default") == "default"
+    assert snapshot.unit("missing") is None
+    assert {"deviceId", "status", "batteryLevel"} <= snapshot.keys()
+    assert repr(snapshot) == repr(DIAG_RESULTS["12345678903"])
+
+
+async def test_reading_position():
+    """Test reading positions follow schema changes."""
+    position = ReadingPosition("batteryLevel")
+    snapshot = DeviceSnapshot.from_dict(DIAG_RESULTS["12345678903"])
+    assert snapshot.values[position(snapshot)] == 54.784637
+
+    hub = DeviceSnapshot.from_dict(DIAG_RESULTS["1234567890"])
+    assert position(hub) is None
+
+
+async def test_schema_reused(hass, mock_api):
+    """Test refreshes reuse each device's schema while readings match."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    previous = coordinator.data["12345678903"]
+    get_latest_data = RenogyClient.get_latest_data
+
+    async def changed_level(self, device_id, timeout=REQUEST_TIMEOUT):
+        data = dict(await get_latest_data(self, device_id, timeout))
+        if device_id == "12345678903":
+            data["batteryLevel"] = 50
+        return data
+
+    with patch.object(RenogyClient, "get_latest_data", changed_level):
+        await coordinator.async_refresh()
+
+    snapshot = coordinator.data["12345678903"]
+    assert snapshot is not previous
+    assert snapshot.schema is previous.schema
+    assert snapshot.reading("batteryLevel") == 50
+    assert coordinator.changed == {("12345678903", "batteryLevel")}
+
+
+async def test_unchanged_snapshot_reused(hass, mock_api):
+    """Test a byte-identical response reuses the device's last snapshot."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    manager = hass.data[DOMAIN][entry.entry_id][MANAGER]
+    previous = coordinator.data
+    with patch("custom_components.renogy.api.json_loads") as mock_loads:
+        await coordinator.async_refresh()
+    assert mock_loads.call_count == 0
+
+    assert coordinator.changed == set()
+    for device_id, snapshot in coordinator.data.items():
+        assert snapshot is previous[device_id]
+    assert manager.stats.endpoints["latest_data"].unchanged == 4
@@ -0,0 +1,95 @@
+"""Benchmark coordinator refresh and entity rendering against the fake API.
+
+Skipped unless pytest is run with --perf. Results are written to the file
+given by --perf-report and compared against tests/fixtures/perf_baseline.json;
+refresh the baseline with --perf-update-baseline.
+"""
+
+import time
+import tracemalloc
+
+import pytest
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.helpers.entity_component import DATA_INSTANCES
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.renogy.const import COORDINATOR, DOMAIN, SENSOR_TYPES
+from custom_components.renogy.sensor import RenogySensor
+
+from .const import CONFIG_DATA
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.perf]
+
+DEVICE_NAME = "Renogy Core"
+DEVICES_PER_HUB = 20
+FLEET_SIZES = (1, 10, 100, 1000)
+UPDATE_RUNS = 5
+RENDER_RUNS = 10
+# Generous, since CI runners vary; this is meant to catch order-of-magnitude
+# regressions, not small drifts.
+TOLERANCE = 3.0
+
+
+@pytest.mark.parametrize("size", FLEET_SIZES)
+async def test_performance(hass, fake_api_server, perf_report, size):
+    """Measure setup, refresh, render time and memory for a fleet size."""
+    baseline, report = perf_report
+    hubs = -(-size // DEVICES_PER_HUB)
+    await fake_api_server(hubs=hubs, devices=-(-size // hubs), seed=size)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+    entry.add_to_hass(hass)
+
+    start = time.perf_counter()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    setup_time = time.perf_counter() - start
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    start = time.perf_counter()
+    for _ in range(UPDATE_RUNS):
+        await coordinator._async_update_data()
+    update_time = (time.perf_counter() - start) / UPDATE_RUNS
+
+    sensors = [
+        entity
+        for entity in hass.data[DATA_INSTANCES][SENSOR_DOMAIN].entities
+        if entity.platform.platform_name == DOMAIN
+    ]
+    start = time.perf_counter()
+    for _ in range(RENDER_RUNS):
+        for sensor in sensors:
+            sensor.native_value
+            sensor.native_unit_of_measurement
+            sensor.available
+    render_time = (time.perf_counter() - start) / RENDER_RUNS / len(sensors)
+
+    tracemalloc.start()
+    entities = [
+        RenogySensor(SENSOR_TYPES[key], device_id, coordinator, entry)
+        for device_id, device in coordinator.data.items()
+        for key in SENSOR_TYPES.keys() & device.keys()
+    ]
+    entity_memory = tracemalloc.get_traced_memory()[0] / len(entities)
+    tracemalloc.stop()
+
+    result = {
+        "devices": len(coordinator.data),
+        "entities": len(sensors),
+        "setup_ms": round(setup_time * 1000, 3),
+        "update_ms": round(update_time * 1000, 3),
+        "render_us_per_entity": round(render_time * 1_000_000, 3),
+        "bytes_per_entity": round(entity_memory),
+    }
+    report[str(size)] = result
+
+    expected = baseline.get(str(size))
+    if expected is None:
+        return
+    assert result["entities"] == expected["entities"]
+    for metric in ("setup_ms", "update_ms", "render_us_per_entity"):
+        assert result[metric] <= expected[metric] * TOLERANCE, metric
+    assert result["bytes_per_entity"] <= expected["bytes_per_entity"] * 1.5
@@ -6,9 +6,12 @@ from unittest.mock import patch
 import pytest
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.renogy.const import DOMAIN
+from custom_components.renogy.api import REQUEST_TIMEOUT, RenogyClient
+from custom_components.renogy.const import COORDINATOR, DOMAIN
+from custom_components.renogy.sensor import RenogySensor
 
 from .const import CONFIG_DATA
 
@@ -31,7 +34,7 @@ async def test_sensors(hass, mock_api, caplog):
         await hass.async_block_till_done()
 
         assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 5
-        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 40
+        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 41
         entries = hass.config_entries.async_entries(DOMAIN)
         assert len(entries) == 1
 
@@ -60,6 +63,17 @@ async def test_sensors(hass, mock_api, caplog):
         assert state
         assert state.state == "54.784637"
         assert state.attributes["unit_of_measurement"] == "%"
+        state = hass.states.get("sensor.rng_ctrl_rvr40_total_energy_generated")
+        assert state
+        assert state.state == "449358.03125"
+        assert state.attributes["unit_of_measurement"] == "Wh"
+        state = hass.states.get("sensor.rng_ctrl_rvr40_system_voltage")
+        assert state
+        assert state.state == "12"
+        assert state.attributes["unit_of_measurement"] == "V"
+        state = hass.states.get("sensor.inverter_output_ampers")
+        assert state
+        assert state.attributes["unit_of_measurement"] == "A"
 
 
 async def test_sensors_error(hass, mock_api_error, caplog):
@@ -76,7 +90,7 @@ async def test_sensors_error(hass, mock_api_error, caplog):
         await hass.async_block_till_done()
 
         assert len(hass.states.async_entity_ids(BINARY_SENSOR_DOMAIN)) == 5
-        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 40
+        assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == 41
         entries = hass.config_entries.async_entries(DOMAIN)
         assert len(entries) == 1
 
@@ -105,3 +119,66 @@ async def test_sensors_error(hass, mock_api_error, caplog):
         assert state
         assert state.state == "54.784637"
         assert state.attributes["unit_of_measurement"] == "%"
+
+
+async def test_sensors_write_only_changed(hass, mock_api):
+    """Test a refresh only writes state for sensors whose reading changed."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    get_latest_data = RenogyClient.get_latest_data
+
+    async def changed_soc(self, device_id, timeout=REQUEST_TIMEOUT):
+        data = dict(await get_latest_data(self, device_id, timeout))
+        if device_id == "12345678902":
+            data["soc"] = 50
+        return data
+
+    with patch.object(RenogySensor, "async_write_ha_state") as mock_write:
+        await coordinator.async_refresh()
+        assert mock_write.call_count == 0
+
+        with patch.object(RenogyClient, "get_latest_data", changed_soc):
+            await coordinator.async_refresh()
+        assert mock_write.call_count == 1
+        assert coordinator.changed == {("12345678902", "soc")}
+
+
+async def test_api_sensors(hass, mock_api):
+    """Test the request statistics sensors on the hub device."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=DEVICE_NAME,
+        data=CONFIG_DATA,
+    )
+
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    latency = "sensor.renogy_one_core_api_latest_data_latency"
+    received = "sensor.renogy_one_core_api_bytes_received"
+    registry = er.async_get(hass)
+    assert (
+        registry.async_get(latency).disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    )
+    assert hass.states.get(latency) is None
+
+    registry.async_update_entity(latency, disabled_by=None)
+    registry.async_update_entity(received, disabled_by=None)
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(latency)
+    assert float(state.state) >= 0
+    assert state.attributes["requests"] == 4
+    assert state.attributes["rate_limited"] == 0
+    assert int(hass.states.get(received).state) > 0
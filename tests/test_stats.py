@@ -0,0 +1,89 @@
+"""Test renogy request statistics."""
+
+import pytest
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from renogyapi.exceptions import RateLimit
+
+from custom_components.renogy.api import RenogyClient
+from custom_components.renogy.const import LATENCY_BUCKETS
+from custom_components.renogy.limiter import RenogyRateLimiter
+from custom_components.renogy.stats import EndpointStats
+
+from .common import load_fixture
+from .conftest import BASE_URL, DEVICE_LIST
+from .const import CONFIG_DATA
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_latency_histogram():
+    """Test latencies land in histogram buckets and percentiles."""
+    stats = EndpointStats()
+    assert stats.mean_latency is None
+    assert stats.percentile(0.5) is None
+
+    for latency in (0.05, 0.05, 0.3, 0.4, 45):
+        stats.record(latency)
+
+    assert stats.requests == 5
+    assert stats.histogram[0] == 2
+    assert stats.histogram[2] == 2
+    assert stats.histogram[-1] == 1
+    assert stats.mean_latency == pytest.approx(9.16)
+    assert stats.percentile(0.5) == 0.5
+    assert stats.percentile(0.95) == 45
+    assert stats.as_dict()["histogram"][f">{LATENCY_BUCKETS[-1]}s"] == 1
+
+
+async def test_request_stats(hass, mock_aioclient):
+    """Test requests record bytes, rate limit hits and retries."""
+    mock_aioclient.get(
+        BASE_URL + DEVICE_LIST,
+        status=429,
+        body="[]",
+        headers={"Retry-After": "0"},
+    )
+    mock_aioclient.get(
+        BASE_URL + DEVICE_LIST,
+        status=200,
+        body=load_fixture("device_list.json"),
+    )
+    client = RenogyClient(
+        secret_key=CONFIG_DATA["secret_key"],
+        access_key=CONFIG_DATA["access_key"],
+        session=async_get_clientsession(hass),
+        limiter=RenogyRateLimiter(rate=50, burst=10),
+    )
+
+    with pytest.raises(RateLimit):
+        await client.get_device_list()
+    await client.get_device_list()
+
+    stats = client.stats.endpoints["device_list"]
+    assert stats.requests == 2
+    assert stats.rate_limited == 1
+    assert stats.retries == 1
+    assert stats.bytes_received == len("[]") + len(load_fixture("device_list.json"))
+    assert client.stats.retries == 1
+    assert client.stats.endpoints["latest_data"].requests == 0
+
+
+async def test_removed_device_pruned(hass, mock_api):
+    """Test a device removed from the account leaves no cached data behind."""
+    client = RenogyClient(
+        secret_key=CONFIG_DATA["secret_key"],
+        access_key=CONFIG_DATA["access_key"],
+        session=async_get_clientsession(hass),
+    )
+    await client.get_device_list()
+    for device_id in ("12345678902", "12345678903"):
+        await client.get_latest_data(device_id)
+    latest_url = f"{BASE_URL}/device/data/latest/12345678903"
+    assert latest_url in client._bodies
+
+    client.prune({"1234567890", "12345678902"})
+
+    assert latest_url not in client._bodies
+    assert BASE_URL + DEVICE_LIST in client._bodies
+    assert set(client.stats.payload_sizes) == {"12345678902"}
+    assert set(client.stats.devices) == {"12345678902"}